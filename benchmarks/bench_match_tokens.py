@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark match_tokens strategies: per-token str.find vs one Aho-Corasick pass.
+
+Builds a ~5.6 MB normalized body from a PDF (or synthetic text) and times both
+strategies for a range of token counts; the crossover sets MATCH_AUTOMATON_MIN_TOKENS
+in check_revise_sources.py.
+
+    python3 benchmarks/bench_match_tokens.py [--pdf some.pdf] [--body-mb 5.6]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from check_revise_sources import _find_token_hits, _normalize_for_match, normalize_body  # noqa: E402
+from text_match_utils import AhoCorasick  # noqa: E402
+
+
+def _body(pdf: Path | None, size: int) -> str:
+    if pdf is not None:
+        from pdf_text import extract_pdf_text
+
+        seed = extract_pdf_text(pdf).text
+    else:
+        rng = random.Random(7)
+        words = [
+            "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 11)))
+            for _ in range(5000)
+        ]
+        seed = " ".join(rng.choice(words) for _ in range(200000))
+    text = seed
+    while len(text) < size:
+        text += "\n" + seed
+    return normalize_body(text[:size]).text
+
+
+def _tokens(body: str, count: int, rng: random.Random) -> List[str]:
+    """Half phrases taken from the body (hits), half absent phrases."""
+    tokens: List[str] = []
+    for n in range(count):
+        if n % 2 == 0:
+            start = rng.randrange(0, len(body) - 40)
+            tokens.append(body[start : start + rng.randint(12, 40)].strip() or "x")
+        else:
+            tokens.append(f"absent phrase {n} zq")
+    return [_normalize_for_match(tok) for tok in tokens]
+
+
+def _per_token(body: str, tokens: List[str]) -> None:
+    for tok in tokens:
+        _find_token_hits(body, tok)
+
+
+def _automaton(body: str, tokens: List[str]) -> None:
+    for _ in AhoCorasick(tokens).iter_matches(body):
+        pass
+
+
+def _best(fn: Callable[[], None], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark match_tokens strategies.")
+    parser.add_argument("--pdf", type=Path, default=None)
+    parser.add_argument("--body-mb", type=float, default=5.6)
+    parser.add_argument("--counts", default="1,5,10,50,100,200,300,500,1000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    body = _body(args.pdf, int(args.body_mb * 1024 * 1024))
+    rng = random.Random(11)
+    print(f"body: {len(body) / 1e6:.1f} M chars")
+    print(f"{'tokens':>7} {'per-token s':>12} {'automaton s':>12}")
+    for count in (int(c) for c in args.counts.split(",")):
+        tokens = _tokens(body, count, rng)
+        per_token = _best(lambda: _per_token(body, tokens), args.repeat)
+        automaton = _best(lambda: _automaton(body, tokens), 1)
+        print(f"{count:>7} {per_token:>12.3f} {automaton:>12.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -10,11 +10,12 @@ from __future__ import annotations
 import argparse
 import csv
 import re
-import zipfile
 import xml.etree.ElementTree as ET
 from pathlib import Path
 from typing import Dict, List, Tuple
+from docx_package import DOCUMENT_PART, FOOTNOTES_PART, DocxPackage
 from run_artifact_utils import is_valid_run_id
+from xml_backend import BACKEND_CHOICES, default_backend_name, get_xml_backend
 
 W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
 QUESTION_PREFIX_RE = re.compile(
@@ -27,11 +28,6 @@ QUESTION_HINT_RE = re.compile(
 )
 
 
-def _read_docx_xml(docx_path: Path, name: str) -> ET.Element:
-    with zipfile.ZipFile(docx_path, "r") as zf:
-        return ET.fromstring(zf.read(name))
-
-
 def _paragraph_text(p: ET.Element) -> str:
     return "".join((t.text or "") for t in p.iter(f"{W}t")).strip()
 
@@ -78,31 +74,12 @@ def _extract_body_paragraphs(document_root: ET.Element) -> List[Tuple[str, List[
     return out
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(description="Build Q->source map for revised FAQ docx.")
-    parser.add_argument("--input-docx", required=True, type=Path)
-    parser.add_argument("--output-csv", type=Path, default=None)
-    parser.add_argument(
-        "--run-dir",
-        type=Path,
-        default=None,
-        help="Run directory root. If set with --run-id and --output-csv omitted, "
-        "defaults to <run-dir>/reports/q_source_map_<run_id>.csv",
-    )
-    parser.add_argument("--run-id", type=str, default=None)
-    args = parser.parse_args()
+Q_MAP_FIELDS = ["Q_no", "Question", "Footnote_IDs", "Sources", "Has_Source"]
 
-    if args.output_csv is None:
-        if args.run_dir is None or args.run_id is None:
-            parser.error("--output-csv is required unless both --run-dir and --run-id are provided")
-        if not is_valid_run_id(args.run_id):
-            parser.error(f"Invalid --run-id format: {args.run_id}")
-        args.output_csv = args.run_dir / "reports" / f"q_source_map_{args.run_id}.csv"
 
-    doc_root = _read_docx_xml(args.input_docx, "word/document.xml")
-    fn_root = _read_docx_xml(args.input_docx, "word/footnotes.xml")
-    fn_map = _extract_footnotes_map(fn_root)
-    paras = _extract_body_paragraphs(doc_root)
+def build_q_map_rows(document_root: ET.Element, footnotes_root: ET.Element) -> List[Dict[str, object]]:
+    fn_map = _extract_footnotes_map(footnotes_root)
+    paras = _extract_body_paragraphs(document_root)
 
     question_idx = [i for i, (text, _) in enumerate(paras) if _is_question(text)]
     rows = []
@@ -123,15 +100,50 @@ def main() -> int:
                 "Has_Source": "YES" if len(ref_ids) > 0 else "NO",
             }
         )
+    return rows
 
-    args.output_csv.parent.mkdir(parents=True, exist_ok=True)
-    with args.output_csv.open("w", newline="", encoding="utf-8-sig") as f:
-        writer = csv.DictWriter(
-            f, fieldnames=["Q_no", "Question", "Footnote_IDs", "Sources", "Has_Source"]
-        )
+
+def write_q_map_csv(path: Path, rows: List[Dict[str, object]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.DictWriter(f, fieldnames=Q_MAP_FIELDS)
         writer.writeheader()
         writer.writerows(rows)
 
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build Q->source map for revised FAQ docx.")
+    parser.add_argument("--input-docx", required=True, type=Path)
+    parser.add_argument("--output-csv", type=Path, default=None)
+    parser.add_argument(
+        "--run-dir",
+        type=Path,
+        default=None,
+        help="Run directory root. If set with --run-id and --output-csv omitted, "
+        "defaults to <run-dir>/reports/q_source_map_<run_id>.csv",
+    )
+    parser.add_argument("--run-id", type=str, default=None)
+    parser.add_argument(
+        "--xml-backend",
+        choices=BACKEND_CHOICES,
+        default=default_backend_name(),
+        help="XML parser: lxml when installed (auto), or force lxml/stdlib. "
+        "Can also be set via REVISE_XML_BACKEND env var.",
+    )
+    args = parser.parse_args()
+
+    if args.output_csv is None:
+        if args.run_dir is None or args.run_id is None:
+            parser.error("--output-csv is required unless both --run-dir and --run-id are provided")
+        if not is_valid_run_id(args.run_id):
+            parser.error(f"Invalid --run-id format: {args.run_id}")
+        args.output_csv = args.run_dir / "reports" / f"q_source_map_{args.run_id}.csv"
+
+    with DocxPackage(args.input_docx, backend=get_xml_backend(args.xml_backend)) as package:
+        rows = build_q_map_rows(package.part(DOCUMENT_PART), package.part(FOOTNOTES_PART))
+
+    write_q_map_csv(args.output_csv, rows)
+
     print(f"Q count: {len(rows)}")
     print(f"Output: {args.output_csv}")
     return 0
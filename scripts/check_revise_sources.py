@@ -10,20 +10,69 @@ Gate rule:
 from __future__ import annotations
 
 import argparse
+import bisect
+import codecs
+import datetime as dt
+import hashlib
 import json
 import os
 import re
-import ssl
-import subprocess
+import shutil
 import tempfile
-import urllib.error
-import urllib.request
-from dataclasses import dataclass
+import threading
+import time
+import urllib.parse
+from concurrent.futures import Executor, ThreadPoolExecutor, wait
+from contextlib import ExitStack
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
-from pypdf import PdfReader
-from run_artifact_utils import is_valid_run_id
+from http_client import (
+    DEFAULT_RANGE_BLOCK_BYTES,
+    HttpClient,
+    HttpError,
+    HttpRangeFile,
+    HttpResponse,
+    parse_content_range,
+)
+from gate_result_store import (
+    GateMemo,
+    GateResultStore,
+    default_gate_cache_dir,
+    parse_max_age,
+    token_set_hash,
+)
+from pdf_text import (
+    EXTRACTOR_ID,
+    PdfPageStream,
+    PdfText,
+    PdfTextCache,
+    default_text_cache_dir,
+    extract_pdf_text,
+    make_extraction_pool,
+)
+from run_artifact_utils import is_valid_run_id, sha256_file
+from source_http_cache import HttpCache, default_cache_dir
+from source_snapshot import SnapshotRecorder, SourceSnapshot
+from text_match_utils import AhoCorasick
+
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_PER_HOST = 2
+REMOTE_SOURCE_TYPES = {"url_text", "remote_pdf"}
+PDF_SOURCE_TYPES = {"remote_pdf", "local_pdf"}
+DEFAULT_MAX_EVIDENCE_HITS = 5
+DEFAULT_MAX_DOWNLOAD_MB = 512
+REMOTE_PDF_MODES = ("download", "range")
+SNIPPET_CONTEXT_CHARS = 60
+# url_text bodies are scanned in chunks of this many bytes in early-exit mode.
+TEXT_SCAN_CHUNK_BYTES = 64 * 1024
+# From this many searchable tokens on, match_tokens uses one Aho-Corasick pass instead of
+# a str.find scan per token (crossover measured by benchmarks/bench_match_tokens.py).
+MATCH_AUTOMATON_MIN_TOKENS = 400
+# Bump when normalization or matching changes, so memoized gate results are not reused.
+MATCH_VERSION = 1
 
 
 @dataclass
@@ -35,110 +84,844 @@ class CheckResult:
     matched_tokens: int
     total_tokens: int
     detail: str
+    cache_status: str = ""
+    raw_path: str = ""
+    # Remote sources only: body bytes received (still content-encoded) and after decoding.
+    bytes_transferred: int = 0
+    bytes_decoded: int = 0
+    # PDF sources: pages matched against, and pages in the document (differs under a page limit).
+    pages_checked: int = 0
+    page_count: int = 0
+    # "early_exit" when the scan could stop once every token was seen, else "full";
+    # stopped_early means it did, so hit counts and evidence cover only the text read.
+    scan_mode: str = "full"
+    stopped_early: bool = False
+    # "hit" (result reused from memo_run_id's check of the same content and tokens),
+    # "miss", or "" when memoization is off or the content has no stable hash.
+    memo_status: str = ""
+    memo_run_id: str = ""
+    # Sources with "max_age": reused means the last verification (at verified_at) was still
+    # fresh, so the stored result was returned without fetching or reading the source.
+    reused: bool = False
+    verified_at: str = ""
+    # The check ran out of time (its own "timeout" or the gate deadline) and was abandoned.
+    timed_out: bool = False
+    text_cache_status: str = ""
+    parsed_path: str = ""
+    # Set when parsed_path is another run's file: a memoized result whose text could not be
+    # rebuilt from the caches points at the parsed text of the run that produced it.
+    parsed_run_id: str = ""
+    evidence: List[Dict[str, object]] = field(default_factory=list)
 
 
-def _fetch_url_text(
-    url: str,
-    timeout: int = 25,
-    ca_bundle: str | None = None,
-    allow_insecure_tls: bool = False,
-) -> str:
-    return _fetch_url_bytes(
-        url,
-        timeout=timeout,
-        ca_bundle=ca_bundle,
-        allow_insecure_tls=allow_insecure_tls,
-    ).decode("utf-8", errors="ignore")
+@dataclass(frozen=True)
+class CheckOptions:
+    """Settings for one gate run, shared by every check in it."""
 
+    # TLS settings for the run's HTTP client; client and pdf_pool are created by run_check_config.
+    ca_bundle: str | None = None
+    allow_insecure_tls: bool = False
+    client: HttpClient | None = None
+    # Sources checked concurrently, and at most max_per_host of them against one host.
+    max_workers: int = DEFAULT_MAX_WORKERS
+    max_per_host: int = DEFAULT_MAX_PER_HOST
+    # Remote bodies are revalidated instead of re-downloaded; raw_dir keeps a copy of each.
+    cache: HttpCache | None = None
+    raw_dir: Path | None = None
+    # Extracted PDF pages are reused by content hash; parsed_dir receives the text each check matched.
+    text_cache: PdfTextCache | None = None
+    parsed_dir: Path | None = None
+    # Shared page-extraction pool; pdf_workers is the default shard count per PDF.
+    pdf_pool: Executor | None = None
+    pdf_workers: int = 1
+    # "download" fetches whole remote PDFs; "range" reads them through HTTP Range requests.
+    remote_pdf_mode: str = "download"
+    # Only the first N pages of each PDF are checked (a source's "page_limit" overrides it).
+    pdf_page_limit: int | None = None
+    # Stop reading a source once all its tokens are seen (a source's "early_exit" overrides it);
+    # full_traversal forces complete scans regardless.
+    early_exit: bool = False
+    full_traversal: bool = False
+    # Gate results reused across runs, keyed by content hash and token set; run_id tags new entries.
+    # Sources with "max_age" that passed within that TTL are not read at all (needs memo).
+    memo: GateResultStore | None = None
+    run_id: str = ""
+    # Seconds the whole gate may take (None = no limit); checks still running then are reported
+    # timed_out. run_check_config turns it into deadline, a time.monotonic() value.
+    time_limit: float | None = None
+    deadline: float | None = None
+    # Hit locations reported per token; 0 reports every hit.
+    max_evidence_hits: int = DEFAULT_MAX_EVIDENCE_HITS
+    # Download size cap (a source's "max_download_mb" overrides it); None = unlimited.
+    max_download_mb: float | None = DEFAULT_MAX_DOWNLOAD_MB
+    # Record every source body into a snapshot, or serve all sources from one (no network).
+    recorder: SnapshotRecorder | None = None
+    snapshot: SourceSnapshot | None = None
 
-def _fetch_url_bytes(
+
+@dataclass
+class FetchedBody:
+    path: Path
+    sha256: str
+    size: int
+    # "hit" (304 revalidated), "miss" (fetched and stored), "uncached" (cache disabled)
+    # or "replay" (served from a source snapshot); results report "range" for Range reads.
+    cache_status: str
+    # Body bytes received for this fetch (0 on a 304 revalidation); size is the decoded size.
+    transferred: int = 0
+    status: int = 200
+    headers: Dict[str, str] = field(default_factory=dict)
+    # True while path is a private spool file that must be removed after use.
+    temporary: bool = False
+
+
+def _fetch_url_to_file(
+    client: HttpClient,
     url: str,
     timeout: int = 25,
-    ca_bundle: str | None = None,
-    allow_insecure_tls: bool = False,
-) -> bytes:
-    req = urllib.request.Request(url, headers={"User-Agent": "revise-source-check/1.0"})
-    if allow_insecure_tls:
-        context = ssl._create_unverified_context()
-    elif ca_bundle:
-        context = ssl.create_default_context(cafile=ca_bundle)
-    else:
-        context = None
+    cache: HttpCache | None = None,
+    max_bytes: int | None = None,
+    spool_dir: Path | None = None,
+    deadline: float | None = None,
+) -> FetchedBody:
+    """Stream url to disk, hashing on the way; cached bodies end up in the content-addressed store."""
+    entry = cache.lookup(url) if cache is not None else None
+    headers = HttpCache.conditional_headers(entry) if entry is not None else {}
+    fd, tmp = _spool_file(cache.spool_dir if cache is not None else spool_dir)
     try:
-        with urllib.request.urlopen(req, timeout=timeout, context=context) as resp:
-            return resp.read()
-    except (urllib.error.URLError, TimeoutError, OSError, ValueError):
-        # Fallback for environments where Python's trust store is out of sync
-        # with system certificates while curl can still validate TLS properly.
-        curl_cmd = ["curl", "-fsSL", "--max-time", str(timeout), "--retry", "1"]
-        if ca_bundle:
-            curl_cmd.extend(["--cacert", ca_bundle])
-        if allow_insecure_tls:
-            curl_cmd.append("-k")
-        curl_cmd.append(url)
-        proc = subprocess.run(curl_cmd, check=False, capture_output=True)
-        if proc.returncode != 0:
-            stderr = proc.stderr.decode("utf-8", errors="ignore").strip()
-            raise urllib.error.URLError(stderr or f"curl failed with exit code {proc.returncode}")
-        return proc.stdout
-
-
-def _fetch_remote_pdf_text(
+        with os.fdopen(fd, "wb") as sink:
+            resp = client.get(url, headers=headers, timeout=timeout, sink=sink, max_bytes=max_bytes, deadline=deadline)
+        if resp.status == 304 and cache is not None and entry is not None:
+            tmp.unlink()
+            if max_bytes is not None and entry.size > max_bytes:
+                raise HttpError(f"Response too large ({entry.size} bytes > limit {max_bytes}) for {url}")
+            entry = cache.revalidated(entry, resp.headers.get("ETag", ""), resp.headers.get("Last-Modified", ""))
+            return FetchedBody(
+                cache.object_path(entry.sha256),
+                entry.sha256,
+                entry.size,
+                cache_status="hit",
+                status=resp.status,
+                headers=dict(resp.headers.items()),
+            )
+        if resp.status != 200:
+            raise HttpError(f"HTTP Error {resp.status}: {resp.reason}")
+        return _downloaded_body(url, resp, tmp, cache)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _spool_file(spool: Path | None) -> Tuple[int, Path]:
+    if spool is not None:
+        spool.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=str(spool) if spool is not None else None, prefix=".download.", suffix=".part")
+    return fd, Path(tmp_name)
+
+
+def _downloaded_body(url: str, resp: HttpResponse, tmp: Path, cache: HttpCache | None) -> FetchedBody:
+    """FetchedBody for a 200 response streamed into tmp; adopted into the cache when there is one."""
+    if cache is None:
+        return FetchedBody(
+            tmp,
+            resp.sha256,
+            resp.size,
+            cache_status="uncached",
+            transferred=resp.transferred,
+            headers=dict(resp.headers.items()),
+            temporary=True,
+        )
+    entry = cache.adopt(
+        url,
+        tmp,
+        resp.sha256,
+        resp.size,
+        etag=resp.headers.get("ETag", ""),
+        last_modified=resp.headers.get("Last-Modified", ""),
+    )
+    return FetchedBody(
+        cache.object_path(entry.sha256),
+        entry.sha256,
+        entry.size,
+        cache_status="miss",
+        transferred=resp.transferred,
+        headers=dict(resp.headers.items()),
+    )
+
+
+def _open_pdf_range(
+    client: HttpClient,
     url: str,
     timeout: int = 30,
-    ca_bundle: str | None = None,
-    allow_insecure_tls: bool = False,
-) -> str:
-    payload = _fetch_url_bytes(
+    cache: HttpCache | None = None,
+    max_bytes: int | None = None,
+    spool_dir: Path | None = None,
+    deadline: float | None = None,
+) -> Tuple[HttpRangeFile | None, FetchedBody | None]:
+    """Range-backed reader for a remote PDF, or a full download when ranges are unavailable.
+
+    A body already in the HTTP cache is revalidated rather than read by ranges. The
+    probe asks for the first block; a server that ignores Range answers 200 and that
+    response becomes the download.
+    """
+    if cache is not None and cache.lookup(url) is not None:
+        return None, _fetch_url_to_file(client, url, timeout, cache, max_bytes, spool_dir, deadline)
+    headers = {"Range": f"bytes=0-{DEFAULT_RANGE_BLOCK_BYTES - 1}", "Accept-Encoding": "identity"}
+    fd, tmp = _spool_file(cache.spool_dir if cache is not None else spool_dir)
+    try:
+        with os.fdopen(fd, "wb") as sink:
+            resp = client.get(url, headers=headers, timeout=timeout, sink=sink, max_bytes=max_bytes, deadline=deadline)
+        if resp.status == 200:
+            return None, _downloaded_body(url, resp, tmp, cache)
+        tmp.unlink()
+        content_range = parse_content_range(resp.headers.get("Content-Range"))
+        if resp.status != 206:
+            raise HttpError(f"HTTP Error {resp.status}: {resp.reason}")
+        if content_range is None or content_range[0] != 0:
+            return None, _fetch_url_to_file(client, url, timeout, cache, max_bytes, spool_dir, deadline)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    etag = resp.headers.get("ETag", "")
+    # If-Range needs a strong validator; weak ETags cannot pin the version.
+    validator = etag if etag and not etag.startswith("W/") else resp.headers.get("Last-Modified", "")
+    range_file = HttpRangeFile(
+        client,
         url,
+        content_range[2],
+        validator=validator,
+        first_block=resp.body,
         timeout=timeout,
-        ca_bundle=ca_bundle,
-        allow_insecure_tls=allow_insecure_tls,
+        max_bytes=max_bytes,
+        deadline=deadline,
     )
+    return range_file, None
 
-    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=True) as tmp:
-        tmp.write(payload)
-        tmp.flush()
-        reader = PdfReader(tmp.name)
-        return "\n".join((page.extract_text() or "") for page in reader.pages)
 
+def _range_text_key(range_file: HttpRangeFile) -> str | None:
+    """Text-cache key for a Range-read PDF: its URL, validator and size (no validator, no caching)."""
+    if not range_file.validator:
+        return None
+    key = f"range\n{range_file.url}\n{range_file.validator}\n{range_file.size}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
 
-def _load_local_pdf_text(path: str) -> str:
-    reader = PdfReader(path)
-    return "\n".join((page.extract_text() or "") for page in reader.pages)
 
+def _replay_body(snapshot: SourceSnapshot, locator: str, spool_dir: Path | None) -> FetchedBody:
+    entry = snapshot.lookup(locator)
+    if entry is None:
+        raise ValueError(f"Not in source snapshot {snapshot.path}: {locator}")
+    return FetchedBody(
+        snapshot.extract(entry, spool_dir),
+        entry.sha256,
+        entry.size,
+        cache_status="replay",
+        status=entry.status,
+        headers=entry.headers,
+        temporary=True,
+    )
 
-def _normalize_for_match(text: str) -> str:
+
+def _save_raw_copy(fetched: FetchedBody, dest: Path, cache: HttpCache | None) -> None:
+    if cache is not None:
+        cache.materialize(fetched.sha256, dest)
+    elif fetched.temporary:
+        # Uncached download: the spooled file itself becomes the run-scoped copy.
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(fetched.path), str(dest))
+        os.chmod(dest, 0o644)
+        fetched.path = dest
+        fetched.temporary = False
+    else:
+        shutil.copyfile(fetched.path, dest)
+
+
+def _source_max_bytes(spec: Dict[str, object], default_mb: float | None) -> int | None:
+    value = spec.get("max_download_mb", default_mb)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        raise ValueError(f"max_download_mb must be a positive number, got {value!r}")
+    return int(value * 1024 * 1024)
+
+
+def _source_pdf_workers(spec: Dict[str, object], default: int) -> int:
+    value = spec.get("pdf_workers", default)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError(f"pdf_workers must be a positive integer, got {value!r}")
+    return value
+
+
+def _source_page_limit(spec: Dict[str, object], default: int | None) -> int | None:
+    value = spec.get("page_limit", default)
+    if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 1):
+        raise ValueError(f"page_limit must be a positive integer, got {value!r}")
+    return value
+
+
+def _source_remote_pdf_mode(spec: Dict[str, object], default: str) -> str:
+    value = spec.get("remote_pdf_mode", default)
+    if value not in REMOTE_PDF_MODES:
+        raise ValueError(f"remote_pdf_mode must be one of {', '.join(REMOTE_PDF_MODES)}, got {value!r}")
+    return str(value)
+
+
+def _source_timeout(spec: Dict[str, object]) -> float | None:
+    if "timeout" not in spec:
+        return None
+    value = spec["timeout"]
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        raise ValueError(f"timeout must be a positive number of seconds, got {value!r}")
+    return float(value)
+
+
+def _check_deadline(deadline: float | None) -> None:
+    if deadline is not None and time.monotonic() >= deadline:
+        raise TimeoutError("Deadline exceeded")
+
+
+def _source_max_age(spec: Dict[str, object]) -> dt.timedelta | None:
+    return parse_max_age(spec["max_age"]) if "max_age" in spec else None
+
+
+def _source_early_exit(spec: Dict[str, object], options: CheckOptions) -> bool:
+    value = spec.get("early_exit", options.early_exit)
+    if not isinstance(value, bool):
+        raise ValueError(f"early_exit must be true or false, got {value!r}")
+    return value and not options.full_traversal
+
+
+def _pdf_text(
+    source: Path | HttpRangeFile,
+    spec: Dict[str, object],
+    options: CheckOptions,
+    sha256: str | None = None,
+    deadline: float | None = None,
+) -> PdfText:
+    if _source_early_exit(spec, options):
+        # Pages are read in order, one at a time, until every token has been seen.
+        stream = PdfPageStream(
+            source,
+            cache=options.text_cache,
+            sha256=sha256,
+            page_limit=_source_page_limit(spec, options.pdf_page_limit),
+            deadline=deadline,
+        )
+        scan = _EarlyExitScan([str(x) for x in spec.get("must_include", [])])
+        for page_no, page in enumerate(stream):
+            if scan.feed(page if page_no == 0 else "\n" + page):
+                break
+        return stream.result()
+    return extract_pdf_text(
+        source,
+        cache=options.text_cache,
+        sha256=sha256,
+        pool=options.pdf_pool,
+        shards=_source_pdf_workers(spec, options.pdf_workers),
+        page_limit=_source_page_limit(spec, options.pdf_page_limit),
+        deadline=deadline,
+    )
+
+
+def _fetch_stats(fetched: FetchedBody | None, range_file: HttpRangeFile | None) -> Tuple[str, int, int]:
+    """(cache_status, bytes_transferred, bytes_decoded) reported for a check."""
+    if range_file is not None:
+        return "range", range_file.transferred, range_file.transferred
+    if fetched is not None:
+        return fetched.cache_status, fetched.transferred, fetched.size
+    return "", 0, 0
+
+
+def _source_file_stem(source_id: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]", "_", source_id)
+
+
+def _collapse_for_match(text: str) -> str:
     # Join words split by line-wrap hyphenation in PDF text extraction,
     # e.g. "inde- pendent" -> "independent".
     merged = re.sub(r"([A-Za-z])-\s+([A-Za-z])", r"\1\2", text)
-    return re.sub(r"\s+", " ", merged).strip().lower()
+    return re.sub(r"\s+", " ", merged).strip()
+
+
+def _normalize_for_match(text: str) -> str:
+    return _collapse_for_match(text).lower()
+
+
+# The substitutions in _collapse_for_match that change length: a hyphen join, or a whitespace
+# run of two or more characters (a single whitespace character becomes one space).
+_SHIFT_RE = re.compile(r"([A-Za-z])-\s+([A-Za-z])|\s\s+")
+# Every other whitespace character becomes a space in place (str.isspace() is empty above U+3000).
+_SPACE_TABLE = {i: " " for i in range(0x3001) if chr(i).isspace() and chr(i) != " "}
+
+
+@dataclass
+class NormalizedBody:
+    """Normalized match text plus a sparse map from its offsets back to the raw text."""
+
+    text: str
+    # Anchor points where the normalized->raw shift changes; between anchors it is constant.
+    norm_anchors: List[int]
+    raw_anchors: List[int]
+    # Offsets after characters that lowercase to several characters, with the total growth so far.
+    lower_anchors: List[int] = field(default_factory=list)
+    lower_growth: List[int] = field(default_factory=list)
+
+    def raw_offset(self, offset: int) -> int:
+        k = bisect.bisect_right(self.lower_anchors, offset) - 1
+        if k >= 0:
+            offset -= self.lower_growth[k]
+        k = bisect.bisect_right(self.norm_anchors, offset) - 1
+        return self.raw_anchors[k] + (offset - self.norm_anchors[k])
+
+
+def normalize_body(text: str) -> NormalizedBody:
+    """_normalize_for_match(text) plus an offset map, recorded only where the shift changes.
+
+    One pass over the text: the length-changing substitutions are applied from the same
+    matches that record the map.
+    """
+    lead = 1 if text[:1].isspace() else 0
+    norm_anchors = [-lead]
+    raw_anchors = [0]
+    shift = lead
+    parts: List[str] = []
+    pos = 0
+    for m in _SHIFT_RE.finditer(text):
+        start, end = m.span()
+        parts.append(text[pos:start])
+        pos = end
+        if m.group(1):
+            parts.append(m.group(1) + m.group(2))
+            raw = end - 1
+        else:
+            parts.append(" ")
+            raw = end
+        # The next kept character (second letter of a join, or the one after the run)
+        # lands one position after the match start in normalized text.
+        norm = start - shift + 1
+        shift = raw - norm
+        norm_anchors.append(norm)
+        raw_anchors.append(raw)
+    parts.append(text[pos:])
+
+    collapsed = "".join(parts).translate(_SPACE_TABLE).strip()
+    body = NormalizedBody(text=collapsed.lower(), norm_anchors=norm_anchors, raw_anchors=raw_anchors)
+    if len(body.text) != len(collapsed):
+        # Rare: characters such as "\u0130" lowercase to two characters.
+        growth = 0
+        for i, ch in enumerate(collapsed):
+            extra = len(ch.lower()) - 1
+            if extra:
+                growth += extra
+                body.lower_anchors.append(i + 1 + growth)
+                body.lower_growth.append(growth)
+    return body
+
+
+def _find_token_hits(normalized_body: str, token: str) -> List[int]:
+    """Start offsets of every (possibly overlapping) occurrence of token, via C-level str.find."""
+    hits: List[int] = []
+    start = normalized_body.find(token)
+    while start != -1:
+        hits.append(start)
+        start = normalized_body.find(token, start + 1)
+    return hits
+
+
+def match_tokens(normalized_body: str, tokens: List[str]) -> List[List[int] | None]:
+    """Start offsets of every hit of each token in an already normalized body.
+
+    Tokens are normalized once. Each is searched with str.find unless there are at least
+    MATCH_AUTOMATON_MIN_TOKENS, when one Aho-Corasick pass is cheaper (see
+    benchmarks/bench_match_tokens.py). A token that normalizes to "" matches trivially and
+    gets None instead of an offset list.
+    """
+    normalized = [_normalize_for_match(tok) for tok in tokens]
+    hits: List[List[int] | None] = [[] if tok else None for tok in normalized]
+    searchable = [i for i, tok in enumerate(normalized) if tok]
+    if len(searchable) < MATCH_AUTOMATON_MIN_TOKENS:
+        for i in searchable:
+            hits[i] = _find_token_hits(normalized_body, normalized[i])
+    else:
+        matcher = AhoCorasick(normalized[i] for i in searchable)
+        for start, pattern_id in matcher.iter_matches(normalized_body):
+            hits[searchable[pattern_id]].append(start)
+    return hits
+
+
+_ASCII_LETTER_RE = re.compile(r"[A-Za-z]")
+_JOIN_RE = re.compile(r"([A-Za-z])-\s+([A-Za-z])")
+_WHITESPACE_RUN_RE = re.compile(r"\s+")
+
+
+def _stream_cut(raw: str) -> int:
+    """Length of the longest prefix of raw whose normalization no following text can change.
+
+    That is the start of the last whitespace run, unless the run follows "<letter>-" (the
+    next text may complete a hyphen join across it); 0 if there is no such run.
+    """
+    cut = 0
+    for m in _WHITESPACE_RUN_RE.finditer(raw):
+        start = m.start()
+        if start and not (raw[start - 1] == "-" and start >= 2 and _ASCII_LETTER_RE.match(raw, start - 2)):
+            cut = start
+    return cut
+
+
+class _EarlyExitScan:
+    """Tracks which must_include tokens have appeared in a body read piece by piece.
+
+    Only the part of the text up to _stream_cut is normalized and scanned, so the scanned
+    text is always a prefix of _normalize_for_match(whole body); the Aho-Corasick state
+    carries over, so tokens spanning a page or chunk boundary are found.
+    """
+
+    def __init__(self, tokens: List[str]) -> None:
+        searchable = sorted({norm for norm in (_normalize_for_match(tok) for tok in tokens) if norm})
+        self._remaining = set(range(len(searchable)))
+        self._scanner = AhoCorasick(searchable).scanner() if searchable else None
+        self._pending = ""
+        self._started = False
+
+    @property
+    def satisfied(self) -> bool:
+        return not self._remaining
+
+    def feed(self, piece: str) -> bool:
+        """Scan the next piece of the body; True once every token has been seen."""
+        if self._scanner is None or self.satisfied:
+            return True
+        raw = self._pending + piece
+        cut = _stream_cut(raw)
+        self._pending = raw[cut:]
+        text = _WHITESPACE_RUN_RE.sub(" ", _JOIN_RE.sub(r"\1\2", raw[:cut]))
+        if not self._started:
+            text = text.lstrip()
+            self._started = bool(text)
+        for _, pattern_id in self._scanner.feed(text.lower()):
+            self._remaining.discard(pattern_id)
+        return self.satisfied
+
+
+def _read_text_body(path: Path, scan: _EarlyExitScan | None = None) -> Tuple[str, bool]:
+    """A url_text body decoded from path, and whether an early-exit scan stopped before its end."""
+    if scan is None:
+        return path.read_bytes().decode("utf-8", errors="ignore"), False
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    parts: List[str] = []
+    with path.open("rb") as f:
+        while True:
+            chunk = f.read(TEXT_SCAN_CHUNK_BYTES)
+            if not chunk:
+                break
+            parts.append(decoder.decode(chunk))
+            if scan.feed(parts[-1]):
+                return "".join(parts), bool(f.read(1))
+    parts.append(decoder.decode(b"", final=True))
+    return "".join(parts), False
+
+
+def _token_evidence(
+    tokens: List[str],
+    token_hits: List[List[int] | None],
+    normalized: NormalizedBody,
+    body: str,
+    page_starts: List[int] | None,
+    max_hits: int,
+) -> List[Dict[str, object]]:
+    """Page, raw offset and snippet for the reported hits of each token."""
+    evidence: List[Dict[str, object]] = []
+    for token, hits in zip(tokens, token_hits):
+        hits = hits or []
+        token_len = len(_normalize_for_match(token))
+        locations: List[Dict[str, object]] = []
+        for hit in hits[:max_hits] if max_hits else hits:
+            raw_start = normalized.raw_offset(hit)
+            raw_end = normalized.raw_offset(hit + token_len - 1) + 1
+            page: int | None = None
+            offset = raw_start
+            if page_starts is not None:
+                index = bisect.bisect_right(page_starts, raw_start) - 1
+                page = index + 1
+                offset = raw_start - page_starts[index]
+            window = body[max(0, raw_start - SNIPPET_CONTEXT_CHARS) : raw_end + SNIPPET_CONTEXT_CHARS]
+            locations.append({"page": page, "offset": offset, "snippet": " ".join(window.split())})
+        evidence.append({"token": token, "hit_count": len(hits), "hits": locations})
+    return evidence
+
+
+class _HostLimiter:
+    """Caps concurrent fetches per remote host; local sources are not limited."""
+
+    def __init__(self, max_per_host: int) -> None:
+        self.max_per_host = max_per_host
+        self._lock = threading.Lock()
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+
+    def slot(self, host: str) -> threading.BoundedSemaphore | None:
+        if not host:
+            return None
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._slots[host]
+
+
+def _source_host(spec: Dict[str, object]) -> str:
+    if str(spec.get("type", "")).strip() not in REMOTE_SOURCE_TYPES:
+        return ""
+    return (urllib.parse.urlsplit(str(spec.get("url", ""))).hostname or "").lower()
+
+
+def _memo_token_hash(source_type: str, spec: Dict[str, object], options: CheckOptions) -> str:
+    tokens = [_normalize_for_match(str(x)) for x in spec.get("must_include", [])]
+    params: Dict[str, object] = {"match_version": MATCH_VERSION}
+    if source_type in PDF_SOURCE_TYPES:
+        params["extractor"] = EXTRACTOR_ID
+        params["page_limit"] = _source_page_limit(spec, options.pdf_page_limit)
+    else:
+        params["decoder"] = "utf-8/ignore"
+    return token_set_hash([tok for tok in tokens if tok], params)
+
+
+def _memo_evidence(evidence: List[Dict[str, object]]) -> Dict[str, Dict[str, object]]:
+    """Per normalized token hit data, as stored in a GateMemo."""
+    tokens: Dict[str, Dict[str, object]] = {}
+    for item in evidence:
+        normalized = _normalize_for_match(str(item["token"]))
+        if normalized:
+            tokens[normalized] = {"hit_count": item["hit_count"], "hits": item["hits"]}
+    return tokens
+
+
+def _memo_result(
+    memo: GateMemo,
+    source_id: str,
+    tier: str,
+    must_include: List[str],
+    max_evidence_hits: int,
+) -> CheckResult:
+    """Rebuild a check result (verdict, detail, evidence) for must_include from a memo."""
+    evidence: List[Dict[str, object]] = []
+    missing_tokens: List[str] = []
+    for token in must_include:
+        normalized = _normalize_for_match(token)
+        stored = memo.tokens.get(normalized, {}) if normalized else {}
+        hit_count = int(stored.get("hit_count", 0))
+        hits = list(stored.get("hits", []))
+        if normalized and not hit_count:
+            missing_tokens.append(token)
+        evidence.append(
+            {"token": token, "hit_count": hit_count, "hits": hits[:max_evidence_hits] if max_evidence_hits else hits}
+        )
+    matched = len(must_include) - len(missing_tokens)
+    ok = matched == len(must_include)
+    return CheckResult(
+        source_id=source_id,
+        tier=tier,
+        ok=ok,
+        reachable=True,
+        matched_tokens=matched,
+        total_tokens=len(must_include),
+        detail="all tokens matched" if ok else "missing evidence tokens: " + "; ".join(missing_tokens[:3]),
+        pages_checked=memo.pages_checked,
+        page_count=memo.page_count,
+        memo_status="hit",
+        memo_run_id=memo.run_id,
+        evidence=evidence,
+    )
+
+
+def _timeout_detail(spec: Dict[str, object], options: CheckOptions) -> str:
+    if options.deadline is not None and time.monotonic() >= options.deadline:
+        return "Timed out: gate deadline reached"
+    return f"Timed out: source timeout of {spec.get('timeout')}s exceeded"
+
+
+def _timed_out_result(source_id: str, spec: Dict[str, object], tier: str, detail: str) -> CheckResult:
+    return CheckResult(
+        source_id=source_id,
+        tier=tier,
+        ok=False,
+        reachable=False,
+        matched_tokens=0,
+        total_tokens=len(spec.get("must_include", [])),
+        detail=detail,
+        timed_out=True,
+    )
+
+
+def _source_locator(spec: Dict[str, object]) -> str:
+    return str(spec.get("url") or spec.get("path") or "")
+
+
+def _write_parsed_text(source_id: str, body: str, parsed_dir: Path) -> str:
+    parsed_file = parsed_dir / f"{_source_file_stem(source_id)}.txt"
+    parsed_file.parent.mkdir(parents=True, exist_ok=True)
+    parsed_file.write_text(body, encoding="utf-8")
+    return str(parsed_file)
+
+
+def _cached_parsed_text(
+    spec: Dict[str, object], options: CheckOptions, content_sha256: str, body_path: Path | None = None
+) -> str | None:
+    """The text a memoized check matched against, if the body or its page texts are at hand."""
+    if str(spec.get("type", "")).strip() == "url_text":
+        if body_path is None and options.cache is not None:
+            body_path = options.cache.object_path(content_sha256)
+        if body_path is None or not body_path.exists():
+            return None
+        return _read_text_body(body_path)[0]
+    if options.text_cache is None:
+        return None
+    page_count = options.text_cache.page_count(content_sha256)
+    if page_count is None:
+        return None
+    page_limit = _source_page_limit(spec, options.pdf_page_limit)
+    pages = options.text_cache.load_pages(content_sha256, min(page_count, page_limit or page_count))
+    if any(page is None for page in pages):
+        return None
+    return PdfText(sha256=content_sha256, pages=[page or "" for page in pages], cache_status="hit").text
+
+
+def _memo_parsed_text(
+    result: CheckResult,
+    memo: GateMemo,
+    spec: Dict[str, object],
+    options: CheckOptions,
+    content_sha256: str,
+    body_path: Path | None = None,
+) -> None:
+    """Keep the parsed-text trail for a memoized result: rewrite it, or point at memo's run."""
+    if options.parsed_dir is None:
+        return
+    text = _cached_parsed_text(spec, options, content_sha256, body_path)
+    if text is not None:
+        result.parsed_path = _write_parsed_text(result.source_id, text, options.parsed_dir)
+    elif memo.parsed_path and Path(memo.parsed_path).exists():
+        result.parsed_path = memo.parsed_path
+        result.parsed_run_id = memo.run_id
+
+
+def _max_age_unavailable(options: CheckOptions) -> str:
+    """Why sources' "max_age" cannot apply in this run, or "" when fresh results can be reused."""
+    if options.memo is None:
+        return "gate result store is off"
+    # Recording and replaying need the actual bodies, so freshness never applies there.
+    if options.recorder is not None:
+        return "recording a source snapshot"
+    if options.snapshot is not None:
+        return "replaying a source snapshot"
+    return ""
+
+
+def _reuse_fresh_result(
+    source_id: str,
+    spec: Dict[str, object],
+    tier: str,
+    options: CheckOptions,
+    max_age: dt.timedelta,
+) -> CheckResult | None:
+    """The stored result for a source verified within max_age, or None if it must be checked."""
+    token_hash = _memo_token_hash(str(spec.get("type", "")).strip(), spec, options)
+    verification = options.memo.last_verified(_source_locator(spec), token_hash)
+    if verification is None or not verification.is_fresh(max_age):
+        return None
+    memo = options.memo.lookup(verification.content_sha256, token_hash)
+    if memo is None or not memo.serves(options.max_evidence_hits):
+        return None
+    must_include = [str(x) for x in spec.get("must_include", [])]
+    result = _memo_result(memo, source_id, tier, must_include, options.max_evidence_hits)
+    result.scan_mode = "early_exit" if _source_early_exit(spec, options) else "full"
+    result.reused = True
+    result.verified_at = verification.verified_at
+    _memo_parsed_text(result, memo, spec, options, verification.content_sha256)
+    return result
 
 
 def _check_one(
     source_id: str,
     spec: Dict[str, object],
     tier: str,
-    ca_bundle: str | None = None,
-    allow_insecure_tls: bool = False,
+    options: CheckOptions = CheckOptions(),
 ) -> CheckResult:
     must_include = [str(x) for x in spec.get("must_include", [])]
     source_type = str(spec.get("type", "")).strip()
     body = ""
+    fetched: FetchedBody | None = None
+    range_file: HttpRangeFile | None = None
+    pdf_text: PdfText | None = None
+    stopped_early = False
+    source: Path | HttpRangeFile | None = None
+    # Identifies the checked bytes for memoization ("" when there is no stable hash).
+    content_sha256 = ""
+    memo_token_hash = ""
+    max_age: dt.timedelta | None = None
+    deadline = options.deadline
+    raw_path = ""
+    parsed_path = ""
 
     try:
-        if source_type == "url_text":
-            body = _fetch_url_text(
-                str(spec["url"]),
-                ca_bundle=ca_bundle,
-                allow_insecure_tls=allow_insecure_tls,
-            )
-        elif source_type == "remote_pdf":
-            body = _fetch_remote_pdf_text(
-                str(spec["url"]),
-                ca_bundle=ca_bundle,
-                allow_insecure_tls=allow_insecure_tls,
-            )
+        timeout = _source_timeout(spec)
+        if timeout is not None:
+            source_deadline = time.monotonic() + timeout
+            deadline = source_deadline if deadline is None else min(deadline, source_deadline)
+        _check_deadline(deadline)
+        max_age = _source_max_age(spec)
+        if max_age is not None and not _max_age_unavailable(options):
+            reused = _reuse_fresh_result(source_id, spec, tier, options, max_age)
+            if reused is not None:
+                return reused
+        if source_type in REMOTE_SOURCE_TYPES:
+            if options.snapshot is not None:
+                fetched = _replay_body(options.snapshot, str(spec["url"]), options.raw_dir)
+            elif (
+                source_type == "remote_pdf"
+                and options.recorder is None
+                and _source_remote_pdf_mode(spec, options.remote_pdf_mode) == "range"
+            ):
+                # Snapshots need whole bodies, so recording always downloads.
+                range_file, fetched = _open_pdf_range(
+                    options.client or HttpClient(),
+                    str(spec["url"]),
+                    cache=options.cache,
+                    max_bytes=_source_max_bytes(spec, options.max_download_mb),
+                    spool_dir=options.raw_dir,
+                    deadline=deadline,
+                )
+            else:
+                fetched = _fetch_url_to_file(
+                    options.client or HttpClient(),
+                    str(spec["url"]),
+                    timeout=25 if source_type == "url_text" else 30,
+                    cache=options.cache,
+                    max_bytes=_source_max_bytes(spec, options.max_download_mb),
+                    spool_dir=options.raw_dir,
+                    deadline=deadline,
+                )
+                if options.recorder is not None:
+                    options.recorder.add(
+                        str(spec["url"]),
+                        "url",
+                        fetched.path,
+                        fetched.sha256,
+                        fetched.size,
+                        status=fetched.status,
+                        headers=fetched.headers,
+                    )
+            if range_file is not None:
+                # Only the blocks pypdf asks for are transferred; there is no whole body to keep.
+                source, content_sha256 = range_file, _range_text_key(range_file) or ""
+            elif fetched is not None:
+                if options.raw_dir is not None:
+                    suffix = ".pdf" if source_type == "remote_pdf" else ".bin"
+                    raw_file = options.raw_dir / (_source_file_stem(source_id) + suffix)
+                    _check_deadline(deadline)
+                    _save_raw_copy(fetched, raw_file, options.cache)
+                    raw_path = str(raw_file)
+                source, content_sha256 = fetched.path, fetched.sha256
+        elif source_type == "local_pdf" and options.snapshot is not None:
+            fetched = _replay_body(options.snapshot, str(spec["path"]), None)
+            source, content_sha256 = fetched.path, fetched.sha256
         elif source_type == "local_pdf":
             path = str(spec["path"])
             if not Path(path).exists():
@@ -151,7 +934,9 @@ def _check_one(
                     total_tokens=len(must_include),
                     detail=f"Local file not found: {path}",
                 )
-            body = _load_local_pdf_text(path)
+            source, content_sha256 = Path(path), sha256_file(Path(path))
+            if options.recorder is not None:
+                options.recorder.add(path, "file", Path(path), content_sha256, Path(path).stat().st_size)
         else:
             return CheckResult(
                 source_id=source_id,
@@ -162,7 +947,39 @@ def _check_one(
                 total_tokens=len(must_include),
                 detail=f"Unsupported source type: {source_type}",
             )
-    except (urllib.error.URLError, TimeoutError, OSError, ValueError) as exc:
+
+        if options.memo is not None and content_sha256:
+            memo_token_hash = _memo_token_hash(source_type, spec, options)
+            memo = options.memo.lookup(content_sha256, memo_token_hash)
+            if memo is not None and memo.serves(options.max_evidence_hits):
+                result = _memo_result(memo, source_id, tier, must_include, options.max_evidence_hits)
+                result.cache_status, result.bytes_transferred, result.bytes_decoded = _fetch_stats(fetched, range_file)
+                result.raw_path = raw_path
+                result.scan_mode = "early_exit" if _source_early_exit(spec, options) else "full"
+                _check_deadline(deadline)
+                _memo_parsed_text(
+                    result, memo, spec, options, content_sha256, source if isinstance(source, Path) else None
+                )
+                if max_age is not None and result.ok:
+                    options.memo.record_verified(_source_locator(spec), memo_token_hash, content_sha256, options.run_id)
+                return result
+
+        _check_deadline(deadline)
+        if source_type == "url_text":
+            body, stopped_early = _read_text_body(
+                Path(source),
+                _EarlyExitScan(must_include) if _source_early_exit(spec, options) else None,
+            )
+        else:
+            pdf_text = _pdf_text(source, spec, options, sha256=content_sha256 or None, deadline=deadline)
+            body = pdf_text.text
+        if options.parsed_dir is not None:
+            _check_deadline(deadline)
+            parsed_path = _write_parsed_text(source_id, body, options.parsed_dir)
+    except (OSError, ValueError) as exc:
+        cache_status, bytes_transferred, bytes_decoded = _fetch_stats(fetched, range_file)
+        # Only a timeout at the check's own budget counts; a plain socket timeout is a fetch failure.
+        timed_out = isinstance(exc, TimeoutError) and deadline is not None and time.monotonic() >= deadline
         return CheckResult(
             source_id=source_id,
             tier=tier,
@@ -170,13 +987,56 @@ def _check_one(
             reachable=False,
             matched_tokens=0,
             total_tokens=len(must_include),
-            detail=f"Fetch/parse failed: {exc}",
+            detail=_timeout_detail(spec, options) if timed_out else f"Fetch/parse failed: {exc}",
+            cache_status=cache_status,
+            raw_path=raw_path,
+            bytes_transferred=bytes_transferred,
+            bytes_decoded=bytes_decoded,
+            timed_out=timed_out,
         )
+    finally:
+        if range_file is not None:
+            range_file.close()
+        if fetched is not None and fetched.temporary:
+            fetched.path.unlink(missing_ok=True)
 
-    normalized_body = _normalize_for_match(body)
-    missing_tokens = [tok for tok in must_include if _normalize_for_match(tok) not in normalized_body]
+    normalized = normalize_body(body)
+    token_hits = match_tokens(normalized.text, must_include)
+    missing_tokens = [tok for tok, hits in zip(must_include, token_hits) if hits is not None and not hits]
     matched = len(must_include) - len(missing_tokens)
     ok = matched == len(must_include)
+    cache_status, bytes_transferred, bytes_decoded = _fetch_stats(fetched, range_file)
+    if pdf_text is not None:
+        page_limit = _source_page_limit(spec, options.pdf_page_limit)
+        stopped_early = len(pdf_text.pages) < min(pdf_text.page_count, page_limit or pdf_text.page_count)
+    evidence = _token_evidence(
+        must_include,
+        token_hits,
+        normalized,
+        body,
+        pdf_text.page_starts if pdf_text is not None else None,
+        options.max_evidence_hits,
+    )
+    # Past the deadline the gate reports this source timed_out, so nothing is stored for it.
+    if deadline is not None and time.monotonic() >= deadline:
+        return _timed_out_result(source_id, spec, tier, _timeout_detail(spec, options))
+    memo_status = ""
+    if memo_token_hash:
+        memo_status = "miss"
+        # Only complete scans describe the content; an early stop saw part of it.
+        if not stopped_early:
+            options.memo.store(
+                content_sha256,
+                memo_token_hash,
+                run_id=options.run_id,
+                evidence_limit=options.max_evidence_hits,
+                pages_checked=len(pdf_text.pages) if pdf_text is not None else 0,
+                page_count=pdf_text.page_count if pdf_text is not None else 0,
+                tokens=_memo_evidence(evidence),
+                parsed_path=str(Path(parsed_path).resolve()) if parsed_path else "",
+            )
+            if max_age is not None and ok:
+                options.memo.record_verified(_source_locator(spec), memo_token_hash, content_sha256, options.run_id)
     return CheckResult(
         source_id=source_id,
         tier=tier,
@@ -189,15 +1049,45 @@ def _check_one(
             if ok
             else "missing evidence tokens: " + "; ".join(missing_tokens[:3])
         ),
+        cache_status=cache_status,
+        raw_path=raw_path,
+        bytes_transferred=bytes_transferred,
+        bytes_decoded=bytes_decoded,
+        pages_checked=len(pdf_text.pages) if pdf_text is not None else 0,
+        page_count=pdf_text.page_count if pdf_text is not None else 0,
+        scan_mode="early_exit" if _source_early_exit(spec, options) else "full",
+        stopped_early=stopped_early,
+        memo_status=memo_status,
+        text_cache_status=pdf_text.cache_status if pdf_text is not None else "",
+        parsed_path=parsed_path,
+        evidence=evidence,
     )
 
 
-def run_check(
-    config_path: Path,
-    ca_bundle: str | None = None,
-    allow_insecure_tls: bool = False,
-) -> Dict[str, object]:
+def run_check(config_path: Path, options: CheckOptions = CheckOptions()) -> Dict[str, object]:
     cfg = json.loads(config_path.read_text(encoding="utf-8"))
+    return run_check_config(cfg, options)
+
+
+def run_check_config(cfg: Dict[str, object], options: CheckOptions = CheckOptions()) -> Dict[str, object]:
+    """Check every configured source with options and return the gate report payload."""
+    if options.max_workers < 1 or options.max_per_host < 1 or options.pdf_workers < 1:
+        raise ValueError("max_workers, max_per_host and pdf_workers must be >= 1")
+    if options.max_evidence_hits < 0:
+        raise ValueError("max_evidence_hits must be >= 0")
+    if options.max_download_mb is not None and options.max_download_mb <= 0:
+        raise ValueError("max_download_mb must be > 0")
+    if options.remote_pdf_mode not in REMOTE_PDF_MODES:
+        raise ValueError(f"remote_pdf_mode must be one of {', '.join(REMOTE_PDF_MODES)}")
+    if options.pdf_page_limit is not None and options.pdf_page_limit < 1:
+        raise ValueError("pdf_page_limit must be >= 1")
+    if options.time_limit is not None and options.time_limit <= 0:
+        raise ValueError("time_limit must be > 0")
+    gate_deadline = time.monotonic() + options.time_limit if options.time_limit is not None else None
+    if options.recorder is not None and options.snapshot is not None:
+        raise ValueError("Cannot record and replay a source snapshot in the same run")
+    if not isinstance(cfg, dict):
+        raise ValueError("Source config must be a JSON object")
     required = cfg.get("required_sources", {})
     optional = cfg.get("optional_sources", {})
     if not isinstance(required, dict) or not isinstance(optional, dict):
@@ -210,32 +1100,92 @@ def run_check(
             "results": [],
         }
 
-    results: List[CheckResult] = []
-    for source_id, spec in required.items():
-        results.append(
-            _check_one(
-                source_id,
-                spec,
-                "required",
-                ca_bundle=ca_bundle,
-                allow_insecure_tls=allow_insecure_tls,
-            )
-        )
-    for source_id, spec in optional.items():
-        results.append(
-            _check_one(
-                source_id,
-                spec,
-                "optional",
-                ca_bundle=ca_bundle,
-                allow_insecure_tls=allow_insecure_tls,
-            )
+    jobs: List[Tuple[str, Dict[str, object], str]] = [
+        (source_id, spec, "required") for source_id, spec in required.items()
+    ] + [(source_id, spec, "optional") for source_id, spec in optional.items()]
+    limiter = _HostLimiter(options.max_per_host)
+    pool_size = max(
+        [options.pdf_workers]
+        + [
+            spec["pdf_workers"]
+            for _, spec, _ in jobs
+            if isinstance(spec, dict)
+            and str(spec.get("type", "")).strip() in PDF_SOURCE_TYPES
+            and isinstance(spec.get("pdf_workers"), int)
+        ]
+    )
+    pdf_pool = make_extraction_pool(pool_size) if pool_size > 1 else None
+    # One client per gate run: a single SSL context and keep-alive connections shared by all checks.
+    client = (
+        HttpClient(
+            ca_bundle=options.ca_bundle,
+            allow_insecure_tls=options.allow_insecure_tls,
+            max_idle_per_host=options.max_per_host,
         )
+        if options.snapshot is None
+        else None
+    )
+    options = replace(
+        options,
+        client=client,
+        cache=options.cache if options.snapshot is None else None,
+        pdf_pool=pdf_pool,
+        deadline=gate_deadline,
+    )
+    gate_timeout_detail = "Timed out: gate deadline reached before the check finished"
+
+    def run_job(job: Tuple[str, Dict[str, object], str]) -> CheckResult:
+        source_id, spec, tier = job
+        slot = limiter.slot(_source_host(spec))
+        if slot is None:
+            return _check_one(source_id, spec, tier, options)
+        left = None if gate_deadline is None else max(0.0, gate_deadline - time.monotonic())
+        if not slot.acquire(timeout=left):
+            return _timed_out_result(source_id, spec, tier, gate_timeout_detail)
+        try:
+            return _check_one(source_id, spec, tier, options)
+        finally:
+            slot.release()
+
+    # Sources are checked concurrently; results stay in config order. Every blocking step and
+    # every write in a check is bounded by the gate deadline, so at the deadline the running
+    # checks stop on their own: they are joined (not abandoned) before the report is built,
+    # and nothing writes run artifacts or memo entries after run_check_config returns.
+    try:
+        if options.max_workers == 1 or len(jobs) <= 1:
+            results: List[CheckResult] = [run_job(job) for job in jobs]
+        else:
+            pool = ThreadPoolExecutor(max_workers=min(options.max_workers, len(jobs)))
+            try:
+                futures = [pool.submit(run_job, job) for job in jobs]
+                left = None if gate_deadline is None else max(0.0, gate_deadline - time.monotonic())
+                wait(futures, timeout=left)
+            finally:
+                # Jobs not started by the deadline are dropped; started ones finish their current step.
+                pool.shutdown(wait=True, cancel_futures=True)
+            results = [
+                _timed_out_result(source_id, spec, tier, gate_timeout_detail)
+                if future.cancelled()
+                else future.result()
+                for future, (source_id, spec, tier) in zip(futures, jobs)
+            ]
+    finally:
+        if pdf_pool is not None:
+            pdf_pool.shutdown(wait=True, cancel_futures=True)
+        if client is not None:
+            client.close()
+
+    max_age_off = _max_age_unavailable(options)
+    if max_age_off:
+        for result, (_, spec, _) in zip(results, jobs):
+            if isinstance(spec, dict) and "max_age" in spec:
+                result.detail += f" (max_age ignored: {max_age_off})"
 
     required_failed = [r for r in results if r.tier == "required" and not r.ok]
     payload = {
         "all_required_passed": len(required_failed) == 0,
         "required_failed_count": len(required_failed),
+        "timed_out_count": sum(1 for r in results if r.timed_out),
         "results": [
             {
                 "source_id": r.source_id,
@@ -245,14 +1195,37 @@ def run_check(
                 "matched_tokens": r.matched_tokens,
                 "total_tokens": r.total_tokens,
                 "detail": r.detail,
+                "cache_status": r.cache_status,
+                "raw_path": r.raw_path,
+                "bytes_transferred": r.bytes_transferred,
+                "bytes_decoded": r.bytes_decoded,
+                "pages_checked": r.pages_checked,
+                "page_count": r.page_count,
+                "scan_mode": r.scan_mode,
+                "stopped_early": r.stopped_early,
+                "memo_status": r.memo_status,
+                "memo_run_id": r.memo_run_id,
+                "reused": r.reused,
+                "verified_at": r.verified_at,
+                "timed_out": r.timed_out,
+                "text_cache_status": r.text_cache_status,
+                "parsed_path": r.parsed_path,
+                "parsed_run_id": r.parsed_run_id,
+                "evidence": r.evidence,
             }
             for r in results
         ],
     }
+    if options.time_limit is not None:
+        payload["deadline_seconds"] = options.time_limit
+    if options.recorder is not None:
+        payload["snapshot_recorded"] = str(options.recorder.path)
+    if options.snapshot is not None:
+        payload["snapshot_replayed"] = str(options.snapshot.path)
     return payload
 
 
-def main() -> int:
+def main(argv: List[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Run source gate checks for revise workflow.")
     parser.add_argument(
         "--config",
@@ -280,7 +1253,133 @@ def main() -> int:
         "defaults to <run-dir>/reports/source_gate_report_<run_id>.json",
     )
     parser.add_argument("--run-id", type=str, default=None)
-    args = parser.parse_args()
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help=f"Sources checked concurrently (default: {DEFAULT_MAX_WORKERS}). 1 checks them serially.",
+    )
+    parser.add_argument(
+        "--max-per-host",
+        type=int,
+        default=DEFAULT_MAX_PER_HOST,
+        help=f"Concurrent fetches allowed against one host (default: {DEFAULT_MAX_PER_HOST}).",
+    )
+    parser.add_argument(
+        "--http-cache-dir",
+        type=Path,
+        default=default_cache_dir(),
+        help="Persistent HTTP cache shared across runs (default: <repo>/cache/http, "
+        "or REVISE_HTTP_CACHE_DIR env var).",
+    )
+    parser.add_argument(
+        "--no-http-cache",
+        action="store_true",
+        help="Always download remote sources in full and do not update the cache.",
+    )
+    parser.add_argument(
+        "--text-cache-dir",
+        type=Path,
+        default=default_text_cache_dir(),
+        help="Persistent per-page PDF text cache (default: <repo>/cache/pdf_text, "
+        "or REVISE_TEXT_CACHE_DIR env var).",
+    )
+    parser.add_argument(
+        "--no-text-cache",
+        action="store_true",
+        help="Always re-extract PDF text and do not update the text cache.",
+    )
+    parser.add_argument(
+        "--pdf-workers",
+        type=int,
+        default=1,
+        help="Processes for parallel PDF page extraction (default: 1 = serial, as in openrevise.api.run_gate). "
+        "A source's \"pdf_workers\" field overrides it.",
+    )
+    parser.add_argument(
+        "--max-evidence-hits",
+        type=int,
+        default=DEFAULT_MAX_EVIDENCE_HITS,
+        help=f"Hit locations recorded per token in the report (default: {DEFAULT_MAX_EVIDENCE_HITS}; 0 = all).",
+    )
+    parser.add_argument(
+        "--max-download-mb",
+        type=float,
+        default=DEFAULT_MAX_DOWNLOAD_MB,
+        help=f"Abort a remote source download beyond this size (default: {DEFAULT_MAX_DOWNLOAD_MB}). "
+        "A source's \"max_download_mb\" field overrides it.",
+    )
+    parser.add_argument(
+        "--remote-pdf-mode",
+        choices=REMOTE_PDF_MODES,
+        default="download",
+        help="download: fetch whole remote PDFs (default). range: read them through HTTP Range "
+        "requests, transferring only the parts pypdf reads. A source's \"remote_pdf_mode\" overrides it.",
+    )
+    parser.add_argument(
+        "--pdf-page-limit",
+        type=int,
+        default=None,
+        help="Check only the first N pages of each PDF (default: all). A source's \"page_limit\" overrides it.",
+    )
+    parser.add_argument(
+        "--gate-cache-dir",
+        type=Path,
+        default=default_gate_cache_dir(),
+        help="Persistent store of check results keyed by source content hash and token set "
+        "(default: <repo>/cache/gate_results, or REVISE_GATE_CACHE_DIR env var).",
+    )
+    parser.add_argument(
+        "--no-gate-cache",
+        action="store_true",
+        help="Always parse and match every source and do not update the gate result store.",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        help="Hard time limit in seconds for the whole gate; sources still pending then are "
+        "reported timed_out (a source's \"timeout\" bounds that source alone).",
+    )
+    parser.add_argument(
+        "--early-exit",
+        action="store_true",
+        help="Pre-flight mode: stop reading a source once all its tokens are found (one page or "
+        "chunk at a time). A source's \"early_exit\" overrides it.",
+    )
+    parser.add_argument(
+        "--full-traversal",
+        action="store_true",
+        help="Always scan every source completely, overriding --early-exit and per-source early_exit.",
+    )
+    snapshot_group = parser.add_mutually_exclusive_group()
+    snapshot_group.add_argument(
+        "--record-snapshot",
+        type=Path,
+        default=None,
+        help="Write every checked source (URL or local path, response headers, body) to this snapshot zip.",
+    )
+    snapshot_group.add_argument(
+        "--replay-snapshot",
+        type=Path,
+        default=None,
+        help="Serve all sources from a recorded snapshot zip instead of the network and local files.",
+    )
+    args = parser.parse_args(argv)
+    if args.max_download_mb <= 0:
+        parser.error("--max-download-mb must be > 0")
+    if args.pdf_page_limit is not None and args.pdf_page_limit < 1:
+        parser.error("--pdf-page-limit must be >= 1")
+    if args.max_evidence_hits < 0:
+        parser.error("--max-evidence-hits must be >= 0")
+    if args.pdf_workers < 1:
+        parser.error("--pdf-workers must be >= 1")
+    if args.max_workers < 1:
+        parser.error("--max-workers must be >= 1")
+    if args.max_per_host < 1:
+        parser.error("--max-per-host must be >= 1")
+    if args.deadline is not None and args.deadline <= 0:
+        parser.error("--deadline must be > 0")
 
     if args.run_dir is not None and args.output_json is None:
         if not args.run_id:
@@ -291,11 +1390,40 @@ def main() -> int:
 
     ca_bundle = str(args.ca_bundle) if args.ca_bundle else None
     try:
-        payload = run_check(
-            args.config,
-            ca_bundle=ca_bundle,
-            allow_insecure_tls=args.allow_insecure_tls,
-        )
+        with ExitStack() as stack:
+            recorder = (
+                stack.enter_context(SnapshotRecorder(args.record_snapshot))
+                if args.record_snapshot is not None
+                else None
+            )
+            snapshot = (
+                stack.enter_context(SourceSnapshot(args.replay_snapshot))
+                if args.replay_snapshot is not None
+                else None
+            )
+            options = CheckOptions(
+                ca_bundle=ca_bundle,
+                allow_insecure_tls=args.allow_insecure_tls,
+                max_workers=args.max_workers,
+                max_per_host=args.max_per_host,
+                cache=None if args.no_http_cache else HttpCache(args.http_cache_dir),
+                raw_dir=args.run_dir / "sources_raw" if args.run_dir is not None else None,
+                text_cache=None if args.no_text_cache else PdfTextCache(args.text_cache_dir),
+                parsed_dir=args.run_dir / "sources_parsed" if args.run_dir is not None else None,
+                pdf_workers=args.pdf_workers,
+                max_evidence_hits=args.max_evidence_hits,
+                max_download_mb=args.max_download_mb,
+                remote_pdf_mode=args.remote_pdf_mode,
+                pdf_page_limit=args.pdf_page_limit,
+                early_exit=args.early_exit,
+                full_traversal=args.full_traversal,
+                memo=None if args.no_gate_cache else GateResultStore(args.gate_cache_dir),
+                run_id=args.run_id or "",
+                time_limit=args.deadline,
+                recorder=recorder,
+                snapshot=snapshot,
+            )
+            payload = run_check(args.config, options)
     except Exception as exc:
         payload = {
             "all_required_passed": False,
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Shared DOCX package access: one open archive, lazily parsed and cached XML parts.
+"""
+
+from __future__ import annotations
+
+import copy
+import os
+import struct
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable
+import xml.etree.ElementTree as ET
+
+from xml_backend import XmlBackend, get_xml_backend
+
+
+DOCUMENT_PART = "word/document.xml"
+FOOTNOTES_PART = "word/footnotes.xml"
+
+# Local file header layout (APPNOTE 4.3.7); only the name/extra lengths are needed to skip it.
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+_ZIP64_EXTRA_ID = 0x0001
+_COPY_CHUNK_BYTES = 1024 * 1024
+# Private ZipFile state the raw copy reads and updates (CPython zipfile, 3.10+).
+_RAW_COPY_ATTRS = ("fp", "start_dir", "filelist", "NameToInfo")
+
+
+def _strip_zip64_extra(extra: bytes) -> bytes:
+    out = bytearray()
+    pos = 0
+    while pos + 4 <= len(extra):
+        field_id, size = struct.unpack_from("<HH", extra, pos)
+        if field_id != _ZIP64_EXTRA_ID:
+            out += extra[pos : pos + 4 + size]
+        pos += 4 + size
+    return bytes(out)
+
+
+def _copy_member_raw(zin: zipfile.ZipFile, zout: zipfile.ZipFile, info: zipfile.ZipInfo) -> None:
+    """Copy one member's compressed bytes verbatim, without an inflate/deflate round trip."""
+    # zipfile has no public API for adding already-compressed data, so this writes the local
+    # header and bytes at zout.start_dir itself and registers the entry the way ZipFile.write
+    # does (tests/test_docx_package.py checks the result member by member). Without that state
+    # (another zipfile implementation) or with an unseekable output, fall back to re-compressing.
+    raw_ok = all(hasattr(zf, attr) for zf in (zin, zout) for attr in _RAW_COPY_ATTRS)
+    if not raw_ok or not hasattr(zout.fp, "seek"):
+        zout.writestr(copy.copy(info), zin.read(info))
+        return
+    src = zin.fp
+    src.seek(info.header_offset)
+    header = _LOCAL_HEADER.unpack(src.read(_LOCAL_HEADER.size))
+    if header[0] != _LOCAL_HEADER_SIGNATURE:
+        raise zipfile.BadZipFile(f"Bad local file header for member: {info.filename}")
+    src.seek(header[10] + header[11], os.SEEK_CUR)
+
+    out_info = copy.copy(info)
+    # CRC and sizes are known up front, so they go into the local header instead of a data descriptor.
+    out_info.flag_bits &= ~0x08
+    out_info.extra = _strip_zip64_extra(info.extra)
+    zout.fp.seek(zout.start_dir)
+    out_info.header_offset = zout.fp.tell()
+    zout.fp.write(out_info.FileHeader())
+    remaining = info.compress_size
+    while remaining > 0:
+        chunk = src.read(min(_COPY_CHUNK_BYTES, remaining))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated member data: {info.filename}")
+        zout.fp.write(chunk)
+        remaining -= len(chunk)
+    zout.filelist.append(out_info)
+    zout.NameToInfo[out_info.filename] = out_info
+    zout.start_dir = zout.fp.tell()
+
+
+class DocxPackage:
+    """An open DOCX archive. The central directory is read once; each XML part is parsed
+    on first access and the parsed tree is cached for the lifetime of the package.
+
+    `source` may be a path or a seekable binary file object (e.g. io.BytesIO).
+    `backend` selects the XML parser/serializer (see xml_backend); default is auto.
+    """
+
+    def __init__(self, source: Path | str | BinaryIO, backend: XmlBackend | None = None) -> None:
+        self.source = source
+        self.backend = backend or get_xml_backend()
+        self._zip = zipfile.ZipFile(source, "r")
+        self._parts: Dict[str, ET.Element] = {}
+
+    def __enter__(self) -> "DocxPackage":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def part(self, name: str) -> ET.Element:
+        root = self._parts.get(name)
+        if root is None:
+            root = self.backend.fromstring(self._zip.read(name))
+            self._parts[name] = root
+        return root
+
+    def save(self, output: Path | str | BinaryIO, changed_parts: Iterable[str]) -> None:
+        """Write a copy of the package: re-serialize changed_parts from the cached trees,
+        raw-copy every other member."""
+        changed = set(changed_parts)
+        with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as zout:
+            for info in self._zip.infolist():
+                if info.filename not in changed:
+                    _copy_member_raw(self._zip, zout, info)
+                    continue
+                data = self.backend.tostring(self.part(info.filename))
+                zout.writestr(copy.copy(info), data)
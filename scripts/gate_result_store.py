@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Persistent store of source gate check results, reused across runs.
+
+A result depends only on the checked bytes, the normalized must_include token set and
+the parse/match settings, so it is keyed by exactly those:
+
+    <root>/<sha[:2]>/<content_sha256>/<token_set_hash>.json
+
+where the token-set hash also covers the settings (matcher version, extractor, page limit).
+Sources with a freshness TTL also record when they were last verified, per locator:
+
+    <root>/verified/<sha256(locator, token_set_hash)>.json
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import json
+import os
+import re
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable
+
+from run_artifact_utils import to_iso_z, utc_now, write_atomic
+
+
+GATE_CACHE_DIR_ENV = "REVISE_GATE_CACHE_DIR"
+_MAX_AGE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([smhdw]?)\s*$")
+_MAX_AGE_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+
+def default_gate_cache_dir() -> Path:
+    if os.environ.get(GATE_CACHE_DIR_ENV):
+        return Path(os.environ[GATE_CACHE_DIR_ENV])
+    return Path(__file__).resolve().parents[1] / "cache" / "gate_results"
+
+
+def parse_max_age(value: object) -> dt.timedelta:
+    """A freshness TTL: seconds as a number, or a string like "90s", "30m", "12h", "7d", "2w"."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        seconds = float(value)
+    else:
+        m = _MAX_AGE_RE.match(value) if isinstance(value, str) else None
+        if m is None:
+            raise ValueError(f"max_age must be seconds or <number>[s|m|h|d|w], got {value!r}")
+        seconds = float(m.group(1)) * _MAX_AGE_UNITS[m.group(2)]
+    if seconds < 0:
+        raise ValueError(f"max_age must not be negative, got {value!r}")
+    return dt.timedelta(seconds=seconds)
+
+
+def token_set_hash(normalized_tokens: Iterable[str], params: Dict[str, object]) -> str:
+    """Order- and duplicate-insensitive hash of normalized tokens plus the settings that shape a result."""
+    payload = json.dumps(
+        {"tokens": sorted(set(normalized_tokens)), "params": params},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class GateMemo:
+    # Run that produced the result ("" when the gate ran without a run id).
+    run_id: str
+    recorded_at: str
+    # Hits kept per token (0 = all); a memo serves requests for at most this many.
+    evidence_limit: int
+    pages_checked: int
+    page_count: int
+    # Normalized token -> {"hit_count": int, "hits": [{"page", "offset", "snippet"}, ...]}.
+    tokens: Dict[str, Dict[str, object]]
+    # The producing run's sources_parsed file ("" when it kept none).
+    parsed_path: str = ""
+
+    def serves(self, max_evidence_hits: int) -> bool:
+        if self.evidence_limit == 0:
+            return True
+        return max_evidence_hits != 0 and max_evidence_hits <= self.evidence_limit
+
+
+@dataclass(frozen=True)
+class Verification:
+    """Last successful check of one source locator against one token set."""
+
+    locator: str
+    verified_at: str
+    content_sha256: str
+    run_id: str
+
+    def is_fresh(self, max_age: dt.timedelta, now: dt.datetime | None = None) -> bool:
+        try:
+            verified_at = dt.datetime.fromisoformat(self.verified_at.replace("Z", "+00:00"))
+        except ValueError:
+            return False
+        return (now or utc_now()) - verified_at < max_age
+
+
+class GateResultStore:
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+
+    def _path(self, content_sha256: str, token_hash: str) -> Path:
+        return self.root / content_sha256[:2] / content_sha256 / f"{token_hash}.json"
+
+    def _verification_path(self, locator: str, token_hash: str) -> Path:
+        key = hashlib.sha256(f"{locator}\n{token_hash}".encode("utf-8")).hexdigest()
+        return self.root / "verified" / f"{key}.json"
+
+    def lookup(self, content_sha256: str, token_hash: str) -> GateMemo | None:
+        try:
+            data = json.loads(self._path(content_sha256, token_hash).read_text(encoding="utf-8"))
+            return GateMemo(**data)
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def store(
+        self,
+        content_sha256: str,
+        token_hash: str,
+        run_id: str,
+        evidence_limit: int,
+        pages_checked: int,
+        page_count: int,
+        tokens: Dict[str, Dict[str, object]],
+        parsed_path: str = "",
+    ) -> GateMemo:
+        memo = GateMemo(
+            run_id=run_id,
+            recorded_at=to_iso_z(utc_now()),
+            evidence_limit=evidence_limit,
+            pages_checked=pages_checked,
+            page_count=page_count,
+            tokens=tokens,
+            parsed_path=parsed_path,
+        )
+        payload = json.dumps(asdict(memo), ensure_ascii=False, indent=2) + "\n"
+        write_atomic(self._path(content_sha256, token_hash), payload.encode("utf-8"))
+        return memo
+
+    def last_verified(self, locator: str, token_hash: str) -> Verification | None:
+        try:
+            data = json.loads(self._verification_path(locator, token_hash).read_text(encoding="utf-8"))
+            verification = Verification(**data)
+        except (OSError, ValueError, TypeError):
+            return None
+        return verification if verification.locator == locator else None
+
+    def record_verified(self, locator: str, token_hash: str, content_sha256: str, run_id: str) -> Verification:
+        verification = Verification(
+            locator=locator,
+            verified_at=to_iso_z(utc_now()),
+            content_sha256=content_sha256,
+            run_id=run_id,
+        )
+        payload = json.dumps(asdict(verification), ensure_ascii=False, indent=2) + "\n"
+        write_atomic(self._verification_path(locator, token_hash), payload.encode("utf-8"))
+        return verification
@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+"""
+Pooled keep-alive HTTP(S) client for source fetching.
+
+One client holds a single SSL context and keeps idle connections per host, so repeated
+requests to the same server reuse TCP/TLS sessions. Redirects, environment proxies
+(http_proxy / https_proxy / no_proxy) and transient-failure retries are handled here.
+Bodies are requested with gzip/deflate content coding and decompressed while streaming.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import http.client
+import io
+import re
+import ssl
+import threading
+import time
+import urllib.parse
+import urllib.request
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.message import Message
+from typing import BinaryIO, Dict, Iterator, List, Tuple
+
+
+USER_AGENT = "revise-source-check/1.0"
+DEFAULT_RETRIES = 1
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+RETRY_STATUSES = {429, 502, 503, 504}
+STREAM_CHUNK_BYTES = 1024 * 1024
+# Error and redirect bodies are only kept for diagnostics; anything past this is dropped.
+ERROR_BODY_MAX_BYTES = 64 * 1024
+ACCEPT_ENCODING = "gzip, deflate"
+DEFAULT_RANGE_BLOCK_BYTES = 256 * 1024
+DEFAULT_RANGE_CACHE_BLOCKS = 64
+CONTENT_RANGE_RE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+)", re.IGNORECASE)
+# Errors that mean a reused keep-alive connection was closed by the server meanwhile.
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+class HttpError(OSError):
+    """HTTP-level failure (bad status, redirect loop, malformed response)."""
+
+
+def _time_left(deadline: float | None, timeout: float, url: str) -> float:
+    """timeout, clamped to the time left before deadline (a time.monotonic() value).
+
+    Raises TimeoutError once the deadline has passed.
+    """
+    if deadline is None:
+        return timeout
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise TimeoutError(f"Deadline exceeded for {url}")
+    return min(timeout, left)
+
+
+@dataclass
+class HttpResponse:
+    url: str
+    status: int
+    reason: str
+    headers: Message
+    # Empty when a 200 body was streamed to a sink; sha256/size describe the decoded bytes.
+    body: bytes
+    sha256: str = ""
+    size: int = 0
+    # Body bytes on the wire, before content decoding.
+    transferred: int = 0
+
+
+PoolKey = Tuple[str, str, int, str]
+
+
+def parse_content_range(value: str | None) -> Tuple[int, int, int] | None:
+    """(first, last, total) from a Content-Range header; None if absent or total is unknown."""
+    match = CONTENT_RANGE_RE.fullmatch((value or "").strip())
+    if match is None:
+        return None
+    first, last, total = (int(g) for g in match.groups())
+    return first, last, total
+
+
+def build_ssl_context(ca_bundle: str | None = None, allow_insecure_tls: bool = False) -> ssl.SSLContext:
+    if allow_insecure_tls:
+        return ssl._create_unverified_context()
+    return ssl.create_default_context(cafile=ca_bundle)
+
+
+def _split_proxy(proxy: str) -> Tuple[str, int, Dict[str, str]]:
+    """Proxy host, port and the Proxy-Authorization header for credentials in its URL."""
+    parts = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    headers: Dict[str, str] = {}
+    if parts.username:
+        credentials = f"{urllib.parse.unquote(parts.username)}:{urllib.parse.unquote(parts.password or '')}"
+        headers["Proxy-Authorization"] = "Basic " + base64.b64encode(credentials.encode()).decode()
+    return parts.hostname or "", parts.port or (443 if parts.scheme == "https" else 80), headers
+
+
+class _BodyDecoder:
+    """Incremental decoder for a response's Content-Encoding (identity, gzip or deflate)."""
+
+    def __init__(self, encoding: str, url: str) -> None:
+        self.encoding = encoding.strip().lower()
+        self.url = url
+        if self.encoding in ("", "identity"):
+            self._zlib = None
+        elif self.encoding in ("gzip", "x-gzip"):
+            self._zlib = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif self.encoding == "deflate":
+            self._zlib = zlib.decompressobj()
+        else:
+            raise HttpError(f"Unsupported Content-Encoding {encoding!r} for {url}")
+        self._started = False
+
+    def decode(self, chunk: bytes) -> Iterator[bytes]:
+        """Decoded pieces of chunk, each at most STREAM_CHUNK_BYTES (bounds memory on highly compressible bodies)."""
+        if self._zlib is None:
+            yield chunk
+            return
+        try:
+            if not self._started and self.encoding == "deflate":
+                self._started = True
+                try:
+                    piece = self._zlib.decompress(chunk, STREAM_CHUNK_BYTES)
+                except zlib.error:
+                    # Some servers send raw deflate without the zlib header.
+                    self._zlib = zlib.decompressobj(-zlib.MAX_WBITS)
+                else:
+                    chunk = self._zlib.unconsumed_tail
+                    yield piece
+            while chunk:
+                piece = self._zlib.decompress(chunk, STREAM_CHUNK_BYTES)
+                chunk = self._zlib.unconsumed_tail
+                yield piece
+        except zlib.error as exc:
+            raise HttpError(f"Corrupt {self.encoding} body for {self.url}: {exc}") from exc
+
+    def flush(self) -> bytes:
+        return self._zlib.flush() if self._zlib is not None else b""
+
+
+class HttpClient:
+    def __init__(
+        self,
+        ca_bundle: str | None = None,
+        allow_insecure_tls: bool = False,
+        retries: int = DEFAULT_RETRIES,
+        max_idle_per_host: int = 4,
+        backoff_seconds: float = 0.5,
+    ) -> None:
+        self.ssl_context = build_ssl_context(ca_bundle, allow_insecure_tls)
+        self.retries = retries
+        self.max_idle_per_host = max_idle_per_host
+        self.backoff_seconds = backoff_seconds
+        self._proxies = urllib.request.getproxies()
+        self._lock = threading.Lock()
+        self._idle: Dict[PoolKey, List[http.client.HTTPConnection]] = {}
+
+    def __enter__(self) -> "HttpClient":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    def _proxy_for(self, scheme: str, host: str) -> str:
+        proxy = self._proxies.get(scheme, "")
+        if proxy and urllib.request.proxy_bypass(host):
+            return ""
+        return proxy
+
+    def _connect(self, key: PoolKey, timeout: float) -> http.client.HTTPConnection:
+        scheme, host, port, proxy = key
+        if not proxy:
+            if scheme == "https":
+                return http.client.HTTPSConnection(host, port, timeout=timeout, context=self.ssl_context)
+            return http.client.HTTPConnection(host, port, timeout=timeout)
+
+        proxy_host, proxy_port, proxy_headers = _split_proxy(proxy)
+        if scheme == "https":
+            # CONNECT tunnel through the proxy; TLS runs end to end with the origin.
+            conn = http.client.HTTPSConnection(proxy_host, proxy_port, timeout=timeout, context=self.ssl_context)
+            conn.set_tunnel(host, port, headers=proxy_headers)
+            return conn
+        return http.client.HTTPConnection(proxy_host, proxy_port, timeout=timeout)
+
+    def _checkout(self, key: PoolKey, timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+        if conn is None:
+            return self._connect(key, timeout), False
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+
+    def _checkin(self, key: PoolKey, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    @staticmethod
+    def _stream_body(
+        resp: http.client.HTTPResponse,
+        sink: BinaryIO,
+        max_bytes: int | None,
+        url: str,
+        conn: http.client.HTTPConnection,
+        timeout: float,
+        deadline: float | None = None,
+        truncate: bool = False,
+    ) -> Tuple[str, int, int]:
+        """Decode resp into sink; returns (sha256, decoded size, transferred size).
+
+        max_bytes bounds both the bytes on the wire and the decoded output: past it the body
+        raises HttpError, or with truncate is cut there and conn is closed. With a deadline,
+        every read waits at most until then, so a trickling body cannot outlast it.
+        """
+        declared = resp.getheader("Content-Length")
+        if (
+            max_bytes is not None
+            and not truncate
+            and declared
+            and declared.isdigit()
+            and int(declared) > max_bytes
+        ):
+            raise HttpError(f"Response too large ({declared} bytes > limit {max_bytes}) for {url}")
+        decoder = _BodyDecoder(resp.getheader("Content-Encoding", ""), url)
+        sink.seek(0)
+        sink.truncate()
+        digest = hashlib.sha256()
+        size = 0
+        transferred = 0
+        while True:
+            if deadline is not None and conn.sock is not None:
+                conn.sock.settimeout(_time_left(deadline, timeout, url))
+            # read() keeps waiting until it has a full chunk; read1() returns what one recv brings.
+            chunk = resp.read1(STREAM_CHUNK_BYTES) if deadline is not None else resp.read(STREAM_CHUNK_BYTES)
+            transferred += len(chunk)
+            for data in decoder.decode(chunk) if chunk else [decoder.flush()]:
+                if max_bytes is not None and size + len(data) > max_bytes:
+                    if not truncate:
+                        raise HttpError(f"Response too large (> limit {max_bytes} bytes) for {url}")
+                    data = data[: max_bytes - size]
+                    chunk = b""
+                size += len(data)
+                digest.update(data)
+                sink.write(data)
+                if not chunk:
+                    break
+            if not chunk:
+                break
+        if max_bytes is not None and size >= max_bytes and truncate:
+            # The rest of the body is still on the wire, so the connection cannot be reused.
+            conn.close()
+        # read1() does not close a fully read response, which would block reuse of the connection.
+        resp.close()
+        sink.flush()
+        return digest.hexdigest(), size, transferred
+
+    def _send_once(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        timeout: float,
+        sink: BinaryIO | None = None,
+        max_bytes: int | None = None,
+        deadline: float | None = None,
+    ) -> HttpResponse:
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"unknown url type: {url!r}")
+        port = parts.port or (443 if scheme == "https" else 80)
+        key: PoolKey = (scheme, parts.hostname, port, self._proxy_for(scheme, parts.hostname))
+
+        host_header = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+        request_headers = {
+            "Host": host_header,
+            "User-Agent": USER_AGENT,
+            "Accept-Encoding": ACCEPT_ENCODING,
+            **headers,
+        }
+        target = urllib.parse.urlunsplit(("", "", parts.path or "/", parts.query, ""))
+        if key[3] and scheme == "http":
+            # Plain HTTP via a proxy: absolute-form request target plus proxy credentials.
+            target = urllib.parse.urlunsplit((scheme, host_header, parts.path or "/", parts.query, ""))
+            request_headers.update(_split_proxy(key[3])[2])
+
+        while True:
+            conn, reused = self._checkout(key, _time_left(deadline, timeout, url))
+            try:
+                conn.request("GET", target, headers=request_headers)
+                resp = conn.getresponse()
+                if sink is not None and resp.status == 200:
+                    body = b""
+                    sha256, size, transferred = self._stream_body(resp, sink, max_bytes, url, conn, timeout, deadline)
+                else:
+                    # Kept in memory: content responses up to max_bytes, other statuses cut short.
+                    buffer = io.BytesIO()
+                    content = resp.status in (200, 206)
+                    limit = max_bytes if content else min(max_bytes or ERROR_BODY_MAX_BYTES, ERROR_BODY_MAX_BYTES)
+                    sha256, size, transferred = self._stream_body(
+                        resp, buffer, limit, url, conn, timeout, deadline, truncate=not content
+                    )
+                    body = buffer.getvalue()
+            except STALE_CONNECTION_ERRORS:
+                conn.close()
+                if reused:
+                    continue
+                raise
+            except http.client.HTTPException as exc:
+                conn.close()
+                raise HttpError(f"{exc.__class__.__name__}: {exc}") from exc
+            except BaseException:
+                conn.close()
+                raise
+            if resp.will_close or conn.sock is None:
+                conn.close()
+            else:
+                self._checkin(key, conn)
+            return HttpResponse(
+                url=url,
+                status=resp.status,
+                reason=resp.reason,
+                headers=resp.headers,
+                body=body,
+                sha256=sha256,
+                size=size,
+                transferred=transferred,
+            )
+
+    def get(
+        self,
+        url: str,
+        headers: Dict[str, str] | None = None,
+        timeout: float = 25,
+        sink: BinaryIO | None = None,
+        max_bytes: int | None = None,
+        deadline: float | None = None,
+    ) -> HttpResponse:
+        """GET url, following redirects and retrying connection errors and 429/5xx gateway statuses.
+
+        Any final status is returned; callers decide which are errors. With a sink, a 200
+        body is streamed into it (rewound on retry), decoded from gzip/deflate and hashed
+        on the way, and bodies over max_bytes raise HttpError. deadline (a time.monotonic()
+        value) bounds the whole call, retries included: past it, TimeoutError is raised.
+        """
+        attempt = 0
+        while True:
+            try:
+                resp = self._get_following_redirects(url, headers or {}, timeout, sink, max_bytes, deadline)
+            except (ssl.SSLCertVerificationError, ValueError, HttpError):
+                raise
+            except OSError as exc:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError(f"Deadline exceeded for {url}") from exc
+                if attempt >= self.retries or not self._retry_in_time(attempt, deadline):
+                    raise
+            else:
+                if (
+                    resp.status not in RETRY_STATUSES
+                    or attempt >= self.retries
+                    or not self._retry_in_time(attempt, deadline)
+                ):
+                    return resp
+            time.sleep(self.backoff_seconds * 2**attempt)
+            attempt += 1
+
+    def _retry_in_time(self, attempt: int, deadline: float | None) -> bool:
+        """False when the backoff before the next retry would already reach deadline."""
+        return deadline is None or time.monotonic() + self.backoff_seconds * 2**attempt < deadline
+
+    def _get_following_redirects(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        timeout: float,
+        sink: BinaryIO | None,
+        max_bytes: int | None,
+        deadline: float | None = None,
+    ) -> HttpResponse:
+        for _ in range(MAX_REDIRECTS + 1):
+            resp = self._send_once(url, headers, timeout, sink, max_bytes, deadline)
+            location = resp.headers.get("Location")
+            if resp.status not in REDIRECT_STATUSES or not location:
+                return resp
+            url = urllib.parse.urljoin(url, location)
+        raise HttpError(f"Too many redirects (>{MAX_REDIRECTS}) for {url}")
+
+    def get_range(
+        self,
+        url: str,
+        first: int,
+        last: int,
+        headers: Dict[str, str] | None = None,
+        timeout: float = 25,
+        deadline: float | None = None,
+    ) -> HttpResponse:
+        """GET bytes first..last (inclusive) of url; HttpError unless the server answers 206 for it.
+
+        A server that ignores the Range header fails fast on the size limit instead of
+        sending the whole body into memory.
+        """
+        request_headers = {**(headers or {}), "Range": f"bytes={first}-{last}", "Accept-Encoding": "identity"}
+        resp = self.get(url, request_headers, timeout, sink=io.BytesIO(), max_bytes=last - first + 1, deadline=deadline)
+        content_range = parse_content_range(resp.headers.get("Content-Range"))
+        if resp.status != 206 or content_range is None or content_range[0] != first:
+            raise HttpError(f"Range request not honoured (HTTP {resp.status}) for {url}")
+        return resp
+
+
+class HttpRangeFile(io.RawIOBase):
+    """Read-only, seekable view of a remote file backed by HTTP Range requests.
+
+    Reads are served from fixed-size blocks kept in a small LRU cache; contiguous missing
+    blocks are fetched with one request. If-Range pins every block to the version seen
+    at open time.
+    """
+
+    def __init__(
+        self,
+        client: HttpClient,
+        url: str,
+        size: int,
+        validator: str = "",
+        first_block: bytes = b"",
+        timeout: float = 25,
+        block_size: int = DEFAULT_RANGE_BLOCK_BYTES,
+        max_blocks: int = DEFAULT_RANGE_CACHE_BLOCKS,
+        max_bytes: int | None = None,
+        deadline: float | None = None,
+    ) -> None:
+        super().__init__()
+        self.client = client
+        self.url = url
+        self.size = size
+        self.validator = validator
+        self.timeout = timeout
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+        self.max_bytes = max_bytes
+        self.deadline = deadline
+        self.transferred = len(first_block)
+        self.requests = 1 if first_block else 0
+        self._pos = 0
+        self._blocks: "OrderedDict[int, bytes]" = OrderedDict()
+        for start in range(0, len(first_block), block_size):
+            data = first_block[start : start + block_size]
+            # Only whole blocks (or the file's final block) are cacheable.
+            if len(data) == block_size or start + len(data) == size:
+                self._remember(start // block_size, data)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError(f"invalid whence: {whence}")
+        if pos < 0:
+            raise ValueError(f"negative seek position {pos}")
+        self._pos = pos
+        return pos
+
+    def _remember(self, index: int, data: bytes) -> None:
+        self._blocks[index] = data
+        self._blocks.move_to_end(index)
+        while len(self._blocks) > self.max_blocks:
+            self._blocks.popitem(last=False)
+
+    def _fetch(self, first_index: int, last_index: int) -> List[bytes]:
+        first = first_index * self.block_size
+        last = min((last_index + 1) * self.block_size, self.size) - 1
+        headers = {"If-Range": self.validator} if self.validator else {}
+        data = self.client.get_range(
+            self.url, first, last, headers=headers, timeout=self.timeout, deadline=self.deadline
+        ).body
+        self.requests += 1
+        self.transferred += len(data)
+        if self.max_bytes is not None and self.transferred > self.max_bytes:
+            raise HttpError(f"Range reads exceeded limit {self.max_bytes} bytes for {self.url}")
+        if len(data) != last - first + 1:
+            raise HttpError(f"Short range response ({len(data)} of {last - first + 1} bytes) for {self.url}")
+        return [data[i : i + self.block_size] for i in range(0, len(data), self.block_size)]
+
+    def _span(self, first_index: int, last_index: int) -> List[bytes]:
+        blocks: Dict[int, bytes] = {}
+        index = first_index
+        while index <= last_index:
+            if index in self._blocks:
+                self._blocks.move_to_end(index)
+                blocks[index] = self._blocks[index]
+                index += 1
+                continue
+            run_end = index
+            while run_end + 1 <= last_index and run_end + 1 not in self._blocks:
+                run_end += 1
+            for offset, data in enumerate(self._fetch(index, run_end)):
+                blocks[index + offset] = data
+                self._remember(index + offset, data)
+            index = run_end + 1
+        return [blocks[i] for i in range(first_index, last_index + 1)]
+
+    def read(self, size: int = -1) -> bytes:
+        end = self.size if size is None or size < 0 else min(self._pos + size, self.size)
+        if self._pos >= end:
+            return b""
+        first_index = self._pos // self.block_size
+        data = b"".join(self._span(first_index, (end - 1) // self.block_size))
+        start = self._pos - first_index * self.block_size
+        chunk = data[start : start + end - self._pos]
+        self._pos = end
+        return chunk
+
+    def readinto(self, buffer: bytearray) -> int:  # type: ignore[override]
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
@@ -0,0 +1,22 @@
+"""
+OpenRevise library API.
+
+The stage modules live as flat scripts next to this package, so `scripts/` must be
+on sys.path (e.g. PYTHONPATH=scripts):
+
+    import openrevise
+
+    out = openrevise.revise(docx_bytes, patch_spec_dict)
+    report = openrevise.run_gate(source_config_dict)
+    rows = openrevise.build_q_map(out.docx_bytes)
+"""
+
+from openrevise.api import ReviseOutput, RevisionAborted, build_q_map, revise, run_gate
+
+__all__ = [
+    "ReviseOutput",
+    "RevisionAborted",
+    "build_q_map",
+    "revise",
+    "run_gate",
+]
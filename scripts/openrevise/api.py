@@ -0,0 +1,179 @@
+"""
+In-memory library API for the revise workflow stages.
+
+Each function mirrors one CLI script but takes and returns Python objects, so a
+long-lived worker can run the stages without forking an interpreter per stage.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import io
+import json
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Union
+
+from build_q_source_map import build_q_map_rows
+from check_revise_sources import (
+    DEFAULT_MAX_DOWNLOAD_MB,
+    DEFAULT_MAX_EVIDENCE_HITS,
+    DEFAULT_MAX_PER_HOST,
+    DEFAULT_MAX_WORKERS,
+    CheckOptions,
+    run_check_config,
+)
+from docx_package import DOCUMENT_PART, FOOTNOTES_PART, DocxPackage
+from gate_result_store import GateResultStore
+from pdf_text import PdfTextCache
+from revise_docx import RevisionAborted, RevisionResult, parse_patch_spec, revise_package
+from source_http_cache import HttpCache
+from source_snapshot import SnapshotRecorder, SourceSnapshot
+from xml_backend import get_xml_backend
+
+
+DocxInput = Union[bytes, bytearray, str, Path, BinaryIO]
+JsonInput = Union[Dict[str, Any], str, Path]
+
+
+@dataclass
+class ReviseOutput:
+    docx_bytes: bytes
+    applied_labels: List[str]
+    new_footnote_ids: Dict[str, int]
+    audit_rows: List[Dict[str, str]]
+    # Revised parts as parsed trees, so later stages (e.g. the Q map) skip re-parsing.
+    document_root: Any
+    footnotes_root: Any
+
+
+def _open_docx(docx: DocxInput, xml_backend: str | None) -> DocxPackage:
+    source = io.BytesIO(docx) if isinstance(docx, (bytes, bytearray)) else docx
+    return DocxPackage(source, backend=get_xml_backend(xml_backend))
+
+
+def _load_json(value: JsonInput) -> Dict[str, Any]:
+    if isinstance(value, dict):
+        return value
+    return json.loads(Path(value).read_text(encoding="utf-8"))
+
+
+def _now_iso_z() -> str:
+    return dt.datetime.now(dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def revise(
+    docx: DocxInput,
+    spec: JsonInput,
+    author: str = "Codex",
+    date: str | None = None,
+    allow_incremental: bool = False,
+    xml_backend: str | None = None,
+) -> ReviseOutput:
+    """Apply a patch spec (dict or JSON path) to a DOCX (bytes, path or file object).
+
+    Raises RevisionAborted for refusals the CLI maps to non-zero exit codes and
+    ValueError for patch-spec / anchor problems.
+    """
+    patches, source_texts = parse_patch_spec(_load_json(spec))
+    with _open_docx(docx, xml_backend) as package:
+        result: RevisionResult = revise_package(
+            package,
+            patches,
+            source_texts,
+            author=author,
+            date_iso=date or _now_iso_z(),
+            allow_incremental=allow_incremental,
+        )
+        out = io.BytesIO()
+        package.save(out, [DOCUMENT_PART, FOOTNOTES_PART])
+        return ReviseOutput(
+            docx_bytes=out.getvalue(),
+            applied_labels=result.applied_labels,
+            new_footnote_ids=result.new_footnote_ids,
+            audit_rows=result.audit_rows,
+            document_root=package.part(DOCUMENT_PART),
+            footnotes_root=package.part(FOOTNOTES_PART),
+        )
+
+
+def run_gate(
+    config: JsonInput,
+    ca_bundle: str | None = None,
+    allow_insecure_tls: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_per_host: int = DEFAULT_MAX_PER_HOST,
+    http_cache_dir: str | Path | None = None,
+    text_cache_dir: str | Path | None = None,
+    pdf_workers: int = 1,
+    max_download_mb: float | None = DEFAULT_MAX_DOWNLOAD_MB,
+    remote_pdf_mode: str = "download",
+    pdf_page_limit: int | None = None,
+    early_exit: bool = False,
+    full_traversal: bool = False,
+    max_evidence_hits: int = DEFAULT_MAX_EVIDENCE_HITS,
+    gate_cache_dir: str | Path | None = None,
+    run_id: str = "",
+    deadline: float | None = None,
+    record_snapshot: str | Path | None = None,
+    replay_snapshot: str | Path | None = None,
+) -> Dict[str, object]:
+    """Run the source gate for a config (dict or JSON path); returns the report payload.
+
+    Remote sources are revalidated against http_cache_dir and PDF text is reused from
+    text_cache_dir when given. pdf_workers > 1 extracts PDF pages on a process pool.
+    Remote bodies larger than max_download_mb fail their check (None = no limit).
+    remote_pdf_mode="range" reads remote PDFs by HTTP Range; pdf_page_limit caps pages checked.
+    early_exit stops reading each source once all its tokens are found (pre-flight checks);
+    full_traversal overrides it and any source's "early_exit". max_evidence_hits caps the
+    hit locations reported per token (0 = all).
+    gate_cache_dir reuses results for sources whose content and tokens were checked before
+    (new results are tagged with run_id). deadline (seconds) bounds the whole gate; sources
+    not finished by then are reported timed_out.
+    record_snapshot writes every source body to a snapshot zip; replay_snapshot serves
+    all sources from one without network access.
+    """
+    with ExitStack() as stack:
+        recorder = (
+            stack.enter_context(SnapshotRecorder(Path(record_snapshot))) if record_snapshot is not None else None
+        )
+        snapshot = (
+            stack.enter_context(SourceSnapshot(Path(replay_snapshot))) if replay_snapshot is not None else None
+        )
+        options = CheckOptions(
+            ca_bundle=ca_bundle,
+            allow_insecure_tls=allow_insecure_tls,
+            max_workers=max_workers,
+            max_per_host=max_per_host,
+            cache=HttpCache(Path(http_cache_dir)) if http_cache_dir is not None else None,
+            text_cache=PdfTextCache(Path(text_cache_dir)) if text_cache_dir is not None else None,
+            pdf_workers=pdf_workers,
+            max_download_mb=max_download_mb,
+            remote_pdf_mode=remote_pdf_mode,
+            pdf_page_limit=pdf_page_limit,
+            early_exit=early_exit,
+            full_traversal=full_traversal,
+            max_evidence_hits=max_evidence_hits,
+            memo=GateResultStore(Path(gate_cache_dir)) if gate_cache_dir is not None else None,
+            run_id=run_id,
+            time_limit=deadline,
+            recorder=recorder,
+            snapshot=snapshot,
+        )
+        return run_check_config(_load_json(config), options)
+
+
+def build_q_map(docx: DocxInput, xml_backend: str | None = None) -> List[Dict[str, object]]:
+    """Q-to-source rows (same columns as q_source_map CSV) for a DOCX."""
+    with _open_docx(docx, xml_backend) as package:
+        return build_q_map_rows(package.part(DOCUMENT_PART), package.part(FOOTNOTES_PART))
+
+
+__all__ = [
+    "ReviseOutput",
+    "RevisionAborted",
+    "build_q_map",
+    "revise",
+    "run_gate",
+]
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+PDF text extraction with a persistent per-page text cache.
+
+Extracted text is keyed by the SHA-256 of the PDF bytes and the installed pypdf
+version (extraction output changes between releases):
+
+    <root>/pypdf-<version>/<sha[:2]>/<sha256>/meta.json
+    <root>/pypdf-<version>/<sha[:2]>/<sha256>/pages/<page_no>.txt
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import time
+from contextlib import ExitStack, contextmanager
+import concurrent.futures
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Union
+
+import pypdf
+from pypdf import PdfReader
+from run_artifact_utils import sha256_file, write_atomic
+
+
+TEXT_CACHE_DIR_ENV = "REVISE_TEXT_CACHE_DIR"
+# Extraction output changes between pypdf releases; anything derived from page text is keyed by this.
+EXTRACTOR_ID = f"pypdf-{pypdf.__version__}"
+# A path is read lazily through an open file; pypdf itself would load a path fully into memory.
+# A seekable binary stream (e.g. an HTTP Range-backed file) is read in place, in this process.
+PdfSource = Union[bytes, Path, BinaryIO]
+# Smaller shards cost more in per-worker PDF parsing than they save.
+MIN_PAGES_PER_SHARD = 8
+
+
+def default_text_cache_dir() -> Path:
+    if os.environ.get(TEXT_CACHE_DIR_ENV):
+        return Path(os.environ[TEXT_CACHE_DIR_ENV])
+    return Path(__file__).resolve().parents[1] / "cache" / "pdf_text"
+
+
+@dataclass
+class PdfText:
+    sha256: str
+    pages: List[str]
+    # "hit" (all pages cached), "partial", "miss" or "uncached" (cache disabled).
+    cache_status: str
+    # Pages in the document; `pages` holds fewer when a page limit applied.
+    page_count: int = 0
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.pages)
+
+    @property
+    def page_starts(self) -> List[int]:
+        """Offset in `text` where each page begins."""
+        starts: List[int] = []
+        offset = 0
+        for page in self.pages:
+            starts.append(offset)
+            offset += len(page) + 1
+        return starts
+
+
+class PdfTextCache:
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root) / EXTRACTOR_ID
+
+    def _entry_dir(self, sha256: str) -> Path:
+        return self.root / sha256[:2] / sha256
+
+    def _page_path(self, sha256: str, page_no: int) -> Path:
+        return self._entry_dir(sha256) / "pages" / f"{page_no:05d}.txt"
+
+    def page_count(self, sha256: str) -> int | None:
+        try:
+            meta = json.loads((self._entry_dir(sha256) / "meta.json").read_text(encoding="utf-8"))
+            return int(meta["page_count"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def load_page(self, sha256: str, page_no: int) -> str | None:
+        try:
+            return self._page_path(sha256, page_no).read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def load_pages(self, sha256: str, page_count: int) -> List[str | None]:
+        return [self.load_page(sha256, page_no) for page_no in range(1, page_count + 1)]
+
+    def store_page(self, sha256: str, page_no: int, text: str) -> None:
+        write_atomic(self._page_path(sha256, page_no), text.encode("utf-8"))
+
+    def store_page_count(self, sha256: str, page_count: int) -> None:
+        meta = json.dumps({"page_count": page_count}) + "\n"
+        write_atomic(self._entry_dir(sha256) / "meta.json", meta.encode("utf-8"))
+
+
+def make_extraction_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool for page extraction.
+
+    Callers submit from threads, so workers come from a forkserver (or spawn) rather
+    than forking the multi-threaded caller.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+
+@contextmanager
+def _open_pdf(source: PdfSource) -> Iterator[PdfReader]:
+    if isinstance(source, Path):
+        with source.open("rb") as f:
+            yield PdfReader(f)
+    elif isinstance(source, bytes):
+        yield PdfReader(io.BytesIO(source))
+    else:
+        yield PdfReader(source)
+
+
+def _extract_pages(source: PdfSource, indices: List[int], deadline: float | None = None) -> List[str]:
+    # Runs in pool workers too: time.monotonic() is system-wide, so the caller's deadline holds here.
+    texts: List[str] = []
+    with _open_pdf(source) as reader:
+        for i in indices:
+            _check_deadline(deadline)
+            texts.append(reader.pages[i].extract_text() or "")
+    return texts
+
+
+def _shard(indices: List[int], shards: int) -> List[List[int]]:
+    size, extra = divmod(len(indices), shards)
+    chunks: List[List[int]] = []
+    start = 0
+    for n in range(shards):
+        stop = start + size + (1 if n < extra else 0)
+        chunks.append(indices[start:stop])
+        start = stop
+    return chunks
+
+
+def _source_digest(source: PdfSource, sha256: str | None) -> str:
+    """Cache key for source; "" for a stream without an explicit sha256 (never cached)."""
+    if sha256:
+        return sha256
+    if isinstance(source, Path):
+        return sha256_file(source)
+    if isinstance(source, bytes):
+        return hashlib.sha256(source).hexdigest()
+    return ""
+
+
+def _check_deadline(deadline: float | None) -> None:
+    if deadline is not None and time.monotonic() >= deadline:
+        raise TimeoutError("Deadline exceeded during PDF text extraction")
+
+
+def _cache_status(cache: PdfTextCache | None, extracted: int, wanted: int) -> str:
+    if cache is None:
+        return "uncached"
+    if not extracted:
+        return "hit"
+    return "miss" if extracted == wanted else "partial"
+
+
+class PdfPageStream:
+    """A PDF's page texts in order, produced one at a time through the text cache.
+
+    Iteration can stop at any page; nothing past it is extracted (the PDF is not even
+    opened when every page read is cached). result() describes the pages read so far.
+    """
+
+    def __init__(
+        self,
+        source: PdfSource,
+        cache: PdfTextCache | None = None,
+        sha256: str | None = None,
+        page_limit: int | None = None,
+        deadline: float | None = None,
+    ) -> None:
+        self.source = source
+        self.digest = _source_digest(source, sha256)
+        self.cache = cache if self.digest else None
+        self.page_limit = page_limit
+        self.deadline = deadline
+        self.page_count = 0
+        self.pages: List[str] = []
+        self.extracted = 0
+        self._wanted: int | None = None
+        self._reader: PdfReader | None = None
+        # Page texts already in hand (loaded or extracted on a pool), by page index.
+        self._ready: Dict[int, str] = {}
+
+    def _pages_wanted(self, stack: ExitStack) -> int:
+        """Pages to read; the PDF is only opened when the cache lacks its page count."""
+        if self._wanted is None:
+            page_count = self.cache.page_count(self.digest) if self.cache is not None else None
+            if page_count is None:
+                self._reader = stack.enter_context(_open_pdf(self.source))
+                page_count = len(self._reader.pages)
+                if self.cache is not None:
+                    self.cache.store_page_count(self.digest, page_count)
+            self.page_count = page_count
+            self._wanted = page_count if self.page_limit is None else min(self.page_limit, page_count)
+        return self._wanted
+
+    def _add_extracted(self, index: int, text: str) -> None:
+        self.extracted += 1
+        if self.cache is not None:
+            self.cache.store_page(self.digest, index + 1, text)
+
+    def _page(self, stack: ExitStack, index: int) -> str:
+        text = self._ready.pop(index, None)
+        if text is None and self.cache is not None:
+            text = self.cache.load_page(self.digest, index + 1)
+        if text is None:
+            _check_deadline(self.deadline)
+            if self._reader is None:
+                self._reader = stack.enter_context(_open_pdf(self.source))
+            text = self._reader.pages[index].extract_text() or ""
+            self._add_extracted(index, text)
+        return text
+
+    def extract_missing(self, pool: Executor, shards: int) -> None:
+        """Extract the uncached pages on pool in up to `shards` page ranges before iterating.
+
+        Each finished range is cached at once, so pages extracted before a TimeoutError
+        are kept. Too few missing pages to split are left to iteration.
+        """
+        with ExitStack() as stack:
+            wanted = self._pages_wanted(stack)
+        self._reader = None
+        missing: List[int] = []
+        for index in range(wanted):
+            text = self.cache.load_page(self.digest, index + 1) if self.cache is not None else None
+            if text is None:
+                missing.append(index)
+            else:
+                self._ready[index] = text
+        shards = min(shards, len(missing) // MIN_PAGES_PER_SHARD)
+        if shards < 2:
+            return
+        chunks = _shard(missing, shards)
+        futures = [pool.submit(_extract_pages, self.source, chunk, self.deadline) for chunk in chunks]
+        try:
+            for chunk, future in zip(chunks, futures):
+                left = None if self.deadline is None else max(0.0, self.deadline - time.monotonic())
+                for index, text in zip(chunk, future.result(timeout=left)):
+                    self._ready[index] = text
+                    self._add_extracted(index, text)
+        # Before 3.11, future.result() raises concurrent.futures.TimeoutError, not the builtin.
+        except concurrent.futures.TimeoutError:
+            for future in futures:
+                future.cancel()
+            raise TimeoutError("Deadline exceeded during PDF text extraction") from None
+
+    def __iter__(self) -> Iterator[str]:
+        with ExitStack() as stack:
+            for index in range(self._pages_wanted(stack)):
+                text = self._page(stack, index)
+                self.pages.append(text)
+                yield text
+            self._reader = None
+
+    def result(self) -> PdfText:
+        return PdfText(
+            sha256=self.digest,
+            pages=list(self.pages),
+            cache_status=_cache_status(self.cache, self.extracted, len(self.pages)),
+            page_count=self.page_count,
+        )
+
+
+def extract_pdf_text(
+    source: PdfSource,
+    cache: PdfTextCache | None = None,
+    sha256: str | None = None,
+    pool: Executor | None = None,
+    shards: int = 1,
+    page_limit: int | None = None,
+    deadline: float | None = None,
+) -> PdfText:
+    """Per-page text of a PDF; only pages missing from the cache are extracted.
+
+    source is PDF bytes, a file path or a seekable stream; with a pool, missing pages of a
+    bytes/path source are split into up to `shards` page ranges extracted in parallel;
+    page order is preserved. Only the first page_limit pages are read when it is set.
+    A stream is only cached under an explicit sha256 (any stable content key).
+    Past deadline (a time.monotonic() value) extraction stops with TimeoutError; pages
+    extracted by then are still cached.
+    """
+    stream = PdfPageStream(source, cache=cache, sha256=sha256, page_limit=page_limit, deadline=deadline)
+    if pool is not None and shards > 1 and isinstance(source, (bytes, Path)):
+        stream.extract_missing(pool, shards)
+    for _ in stream:
+        pass
+    return stream.result()
@@ -7,11 +7,13 @@ from __future__ import annotations
 
 import argparse
 import re
-import zipfile
 import xml.etree.ElementTree as ET
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+from docx_package import DOCUMENT_PART, FOOTNOTES_PART, DocxPackage
+from xml_backend import BACKEND_CHOICES, default_backend_name, get_xml_backend
+
 W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
 QUESTION_PREFIX_RE = re.compile(
     r"^\s*(?:Q\s*\d+|Question\s*\d+|\d+[\.\)]|[一二三四五六七八九十]+[、\.])\s*",
@@ -23,11 +25,6 @@ QUESTION_HINT_RE = re.compile(
 )
 
 
-def _read_xml(docx_path: Path, member: str) -> ET.Element:
-    with zipfile.ZipFile(docx_path, "r") as zf:
-        return ET.fromstring(zf.read(member))
-
-
 def _text(node: ET.Element) -> str:
     return "".join((t.text or "") for t in node.iter(f"{W}t")).strip()
 
@@ -74,12 +71,18 @@ def main() -> int:
     parser = argparse.ArgumentParser(description="Query one Q->source mapping from revised DOCX.")
     parser.add_argument("--input-docx", required=True, type=Path)
     parser.add_argument("--q", required=True, type=int, help="Question order number in FAQ body (Q1..Qn).")
+    parser.add_argument(
+        "--xml-backend",
+        choices=BACKEND_CHOICES,
+        default=default_backend_name(),
+        help="XML parser: lxml when installed (auto), or force lxml/stdlib. "
+        "Can also be set via REVISE_XML_BACKEND env var.",
+    )
     args = parser.parse_args()
 
-    doc_root = _read_xml(args.input_docx, "word/document.xml")
-    fn_root = _read_xml(args.input_docx, "word/footnotes.xml")
-    fn_map = _footnotes_map(fn_root)
-    paras = _body_paragraphs(doc_root)
+    with DocxPackage(args.input_docx, backend=get_xml_backend(args.xml_backend)) as package:
+        fn_map = _footnotes_map(package.part(FOOTNOTES_PART))
+        paras = _body_paragraphs(package.part(DOCUMENT_PART))
     question_pos = [i for i, (t, _) in enumerate(paras) if _is_question(t)]
 
     if args.q < 1 or args.q > len(question_pos):
@@ -9,19 +9,22 @@ across legal, consulting, medical, IR, and operations workflows.
 from __future__ import annotations
 
 import argparse
+import bisect
 import csv
 import datetime as dt
 import json
 import re
 import shutil
 import sys
-import zipfile
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, FrozenSet, Iterable, List, Tuple
 import xml.etree.ElementTree as ET
 
+from docx_package import DOCUMENT_PART, FOOTNOTES_PART, DocxPackage
 from run_artifact_utils import is_valid_run_id
+from text_match_utils import AhoCorasick
+from xml_backend import BACKEND_CHOICES, default_backend_name, get_xml_backend, sub_element
 
 
 W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
@@ -68,28 +71,146 @@ def _matches(text: str, needle: str, mode: str) -> bool:
     return text == needle if mode == "exact" else needle in text
 
 
-def _prev_non_empty_text(paragraphs: List[ET.Element], idx: int) -> str:
-    for i in range(idx - 1, -1, -1):
-        candidate = paragraph_text(paragraphs[i]).strip()
-        if candidate:
-            return candidate
-    return ""
-
-
-def _find_patch_target(paragraphs: List[ET.Element], patch: ParagraphPatch) -> Tuple[ET.Element, int, str]:
-    candidates: List[Tuple[int, ET.Element, str]] = []
-    for idx, para in enumerate(paragraphs):
-        text = paragraph_text(para)
-        if _matches(text, patch.anchor, patch.anchor_match):
-            question_text = _prev_non_empty_text(paragraphs, idx)
-            candidates.append((idx, para, question_text))
-
-    if patch.question_anchor:
-        candidates = [
-            c
-            for c in candidates
-            if _matches(c[2], patch.question_anchor, patch.question_match)
+_NO_HITS: FrozenSet[int] = frozenset()
+
+
+@dataclass
+class IndexedParagraph:
+    element: ET.Element
+    text: str
+    prev: int  # position of the nearest non-empty previous paragraph, -1 if none
+    hits: FrozenSet[int] = _NO_HITS  # contains-needles found in text
+    stripped_hits: FrozenSet[int] = _NO_HITS  # contains-needles found in text.strip()
+
+
+class ParagraphIndex:
+    """Body paragraphs with cached text and question context, built once per document.
+
+    All contains-mode anchors and question anchors of the patch spec are compiled into
+    one Aho-Corasick automaton, so resolving every patch costs one pass over the body text.
+    Exact-mode anchors resolve through hash maps keyed by paragraph text.
+    """
+
+    def __init__(self, paragraphs: List[ET.Element], patches: Iterable[ParagraphPatch] = ()) -> None:
+        self._needle_ids: Dict[str, int] = {}
+        for patch in patches:
+            if patch.anchor_match == "contains" and patch.anchor:
+                self._needle_ids.setdefault(patch.anchor, len(self._needle_ids))
+            if patch.question_match == "contains" and patch.question_anchor:
+                self._needle_ids.setdefault(patch.question_anchor, len(self._needle_ids))
+        self._matcher = AhoCorasick(self._needle_ids) if self._needle_ids else None
+        self._positions: List[List[int]] = [[] for _ in self._needle_ids]
+        self._by_text: Dict[str, List[int]] = {}
+        self._by_question: Dict[str, List[int]] = {}  # stripped non-empty text -> positions
+
+        self.entries: List[IndexedParagraph] = []
+        prev = -1
+        for pos, para in enumerate(paragraphs):
+            entry = IndexedParagraph(element=para, text=paragraph_text(para), prev=prev)
+            self.entries.append(entry)
+            self._register(pos)
+            if entry.text.strip():
+                prev = pos
+
+    def _register(self, pos: int) -> None:
+        entry = self.entries[pos]
+        bisect.insort(self._by_text.setdefault(entry.text, []), pos)
+        stripped = entry.text.strip()
+        if stripped:
+            bisect.insort(self._by_question.setdefault(stripped, []), pos)
+        if self._matcher is None or not entry.text:
+            entry.hits = entry.stripped_hits = _NO_HITS
+            return
+        text = entry.text
+        lead = len(text) - len(text.lstrip())
+        tail = len(text.rstrip())
+        hits = set()
+        stripped_hits = set()
+        for start, needle_id in self._matcher.iter_matches(text):
+            hits.add(needle_id)
+            if start >= lead and start + len(self._matcher.patterns[needle_id]) <= tail:
+                stripped_hits.add(needle_id)
+        entry.hits = frozenset(hits) if hits else _NO_HITS
+        entry.stripped_hits = frozenset(stripped_hits) if stripped_hits else _NO_HITS
+        for needle_id in hits:
+            bisect.insort(self._positions[needle_id], pos)
+
+    def question_text(self, pos: int) -> str:
+        prev = self.entries[pos].prev
+        return self.entries[prev].text.strip() if prev >= 0 else ""
+
+    def _unregister(self, pos: int) -> None:
+        entry = self.entries[pos]
+        self._by_text[entry.text].remove(pos)
+        stripped = entry.text.strip()
+        if stripped:
+            self._by_question[stripped].remove(pos)
+        for needle_id in entry.hits:
+            self._positions[needle_id].remove(pos)
+
+    def anchor_positions(self, needle: str, mode: str) -> List[int]:
+        if mode == "exact":
+            return list(self._by_text.get(needle, ()))
+        needle_id = self._needle_ids.get(needle)
+        if needle_id is not None:
+            return list(self._positions[needle_id])
+        return [pos for pos, entry in enumerate(self.entries) if _matches(entry.text, needle, mode)]
+
+    def anchor_matches(self, pos: int, needle: str, mode: str) -> bool:
+        entry = self.entries[pos]
+        needle_id = self._needle_ids.get(needle)
+        if mode == "contains" and needle_id is not None:
+            return needle_id in entry.hits
+        return _matches(entry.text, needle, mode)
+
+    def exact_question_positions(self, needle: str) -> List[int]:
+        """Positions whose question context equals needle, i.e. the paragraphs following it."""
+        out: List[int] = []
+        for question_pos in self._by_question.get(needle, ()):
+            for pos in range(question_pos + 1, len(self.entries)):
+                out.append(pos)
+                if self.entries[pos].text.strip():
+                    break
+        return out
+
+    def question_matches(self, pos: int, needle: str, mode: str) -> bool:
+        needle_id = self._needle_ids.get(needle)
+        prev = self.entries[pos].prev
+        if mode == "contains" and needle_id is not None and prev >= 0:
+            return needle_id in self.entries[prev].stripped_hits
+        return _matches(self.question_text(pos), needle, mode)
+
+    def refresh(self, pos: int) -> None:
+        """Re-read one paragraph after it was edited and repair the question context after it."""
+        entry = self.entries[pos]
+        self._unregister(pos)
+        entry.text = paragraph_text(entry.element)
+        self._register(pos)
+        prev = pos if entry.text.strip() else entry.prev
+        for follower in self.entries[pos + 1 :]:
+            follower.prev = prev
+            if follower.text.strip():
+                break
+
+
+def _find_patch_target(index: ParagraphIndex, patch: ParagraphPatch) -> Tuple[ET.Element, int, str]:
+    if patch.question_anchor and patch.question_match == "exact":
+        positions = [
+            pos
+            for pos in index.exact_question_positions(patch.question_anchor)
+            if index.anchor_matches(pos, patch.anchor, patch.anchor_match)
         ]
+    else:
+        positions = index.anchor_positions(patch.anchor, patch.anchor_match)
+        if patch.question_anchor:
+            positions = [
+                pos
+                for pos in positions
+                if index.question_matches(pos, patch.question_anchor, patch.question_match)
+            ]
+    candidates: List[Tuple[int, ET.Element, str]] = [
+        (pos, index.entries[pos].element, index.question_text(pos)) for pos in positions
+    ]
 
     if len(candidates) == 0:
         suffix = ""
@@ -112,7 +233,12 @@ def _find_patch_target(paragraphs: List[ET.Element], patch: ParagraphPatch) -> T
 
 
 def load_patch_spec(path: Path) -> Tuple[List[ParagraphPatch], Dict[str, str]]:
-    payload = json.loads(path.read_text(encoding="utf-8"))
+    return parse_patch_spec(json.loads(path.read_text(encoding="utf-8")))
+
+
+def parse_patch_spec(payload: Dict[str, object]) -> Tuple[List[ParagraphPatch], Dict[str, str]]:
+    if not isinstance(payload, dict):
+        raise ValueError("patch-spec must be a JSON object")
     patch_items = payload.get("patches", [])
     if not isinstance(patch_items, list) or not patch_items:
         raise ValueError("patch-spec must contain non-empty list field: patches")
@@ -224,132 +350,135 @@ def assert_patch_policy(
             raise ValueError(f"Patch {patch.label} has no verifiable source footnote reference")
 
 
-def max_footnote_id(footnotes_root: ET.Element) -> int:
-    ids = []
+@dataclass(frozen=True)
+class FootnoteStats:
+    ids: set[int]
+    max_id: int
+    text_map: Dict[int, str]
+
+
+def scan_footnotes(footnotes_root: ET.Element) -> FootnoteStats:
+    """Collect footnote ids, max id and texts in a single traversal of footnotes.xml."""
+    id_attr = qn("id")
+    t_tag = qn("t")
+    ids: set[int] = set()
+    max_id = 0
+    text_map: Dict[int, str] = {}
     for fn in footnotes_root.findall(qn("footnote")):
-        raw = fn.get(qn("id"))
+        raw = fn.get(id_attr)
         if raw is None:
             continue
         try:
             value = int(raw)
         except ValueError:
             continue
-        if value >= 0:
-            ids.append(value)
-    return max(ids) if ids else 0
-
-
-def existing_footnote_ids(footnotes_root: ET.Element) -> set[int]:
-    out: set[int] = set()
-    for fn in footnotes_root.findall(qn("footnote")):
-        raw = fn.get(qn("id"))
-        if raw is None:
+        if value < 0:
             continue
+        max_id = max(max_id, value)
         if raw.lstrip("-").isdigit():
-            value = int(raw)
-            if value >= 0:
-                out.add(value)
-    return out
-
-
-def footnote_text_map(footnotes_root: ET.Element) -> Dict[int, str]:
-    out: Dict[int, str] = {}
-    for fn in footnotes_root.findall(qn("footnote")):
-        raw = fn.get(qn("id"))
-        if raw is None or not raw.lstrip("-").isdigit():
-            continue
-        fid = int(raw)
-        if fid < 0:
-            continue
-        out[fid] = "".join((node.text or "") for node in fn.iter(qn("t"))).strip()
-    return out
+            ids.add(value)
+            text_map[value] = "".join((node.text or "") for node in fn.iter(t_tag)).strip()
+    return FootnoteStats(ids=ids, max_id=max_id, text_map=text_map)
 
 
 def add_footnote(footnotes_root: ET.Element, footnote_id: int, text: str) -> None:
-    footnote = ET.Element(qn("footnote"), {qn("id"): str(footnote_id)})
-    p = ET.SubElement(footnote, qn("p"))
-    ppr = ET.SubElement(p, qn("pPr"))
-    ET.SubElement(ppr, qn("pStyle"), {qn("val"): "af7"})
-    ppr_rpr = ET.SubElement(ppr, qn("rPr"))
-    ET.SubElement(
+    footnote = footnotes_root.makeelement(qn("footnote"), {qn("id"): str(footnote_id)})
+    p = sub_element(footnote, qn("p"))
+    ppr = sub_element(p, qn("pPr"))
+    sub_element(ppr, qn("pStyle"), {qn("val"): "af7"})
+    ppr_rpr = sub_element(ppr, qn("rPr"))
+    sub_element(
         ppr_rpr,
         qn("rFonts"),
         {qn("ascii"): "Times New Roman", qn("hAnsi"): "Times New Roman", qn("cs"): "Times New Roman"},
     )
 
-    r_ref = ET.SubElement(p, qn("r"))
-    r_ref_pr = ET.SubElement(r_ref, qn("rPr"))
-    ET.SubElement(r_ref_pr, qn("rStyle"), {qn("val"): "af9"})
-    ET.SubElement(
+    r_ref = sub_element(p, qn("r"))
+    r_ref_pr = sub_element(r_ref, qn("rPr"))
+    sub_element(r_ref_pr, qn("rStyle"), {qn("val"): "af9"})
+    sub_element(
         r_ref_pr,
         qn("rFonts"),
         {qn("ascii"): "Times New Roman", qn("hAnsi"): "Times New Roman", qn("cs"): "Times New Roman"},
     )
-    ET.SubElement(r_ref, qn("footnoteRef"))
+    sub_element(r_ref, qn("footnoteRef"))
 
-    r_text = ET.SubElement(p, qn("r"))
-    r_text_pr = ET.SubElement(r_text, qn("rPr"))
-    ET.SubElement(
+    r_text = sub_element(p, qn("r"))
+    r_text_pr = sub_element(r_text, qn("rPr"))
+    sub_element(
         r_text_pr,
         qn("rFonts"),
         {qn("ascii"): "Times New Roman", qn("hAnsi"): "Times New Roman", qn("cs"): "Times New Roman"},
     )
-    t = ET.SubElement(r_text, qn("t"))
+    t = sub_element(r_text, qn("t"))
     t.text = text
 
     footnotes_root.append(footnote)
 
 
-def next_change_id(document_root: ET.Element) -> int:
-    values: List[int] = []
-    for elem in document_root.iter():
-        if elem.tag not in (qn("ins"), qn("del")):
-            continue
-        raw = elem.get(qn("id"))
-        if raw is None:
-            continue
-        try:
-            values.append(int(raw))
-        except ValueError:
-            continue
-    return (max(values) + 1) if values else 1
+@dataclass(frozen=True)
+class DocumentStats:
+    max_change_id: int | None  # None when no w:ins/w:del carries a numeric id
+    ins_count: int
+    del_count: int
 
+    @property
+    def next_change_id(self) -> int:
+        return (self.max_change_id + 1) if self.max_change_id is not None else 1
 
-def tracked_change_counts(document_root: ET.Element) -> Tuple[int, int]:
+
+def scan_document(document_root: ET.Element) -> DocumentStats:
+    """Collect tracked-change counts and the highest change id in a single traversal of document.xml."""
+    ins_tag = qn("ins")
+    del_tag = qn("del")
+    id_attr = qn("id")
     ins_count = 0
     del_count = 0
+    max_change_id: int | None = None
     for elem in document_root.iter():
-        if elem.tag == qn("ins"):
+        tag = elem.tag
+        if tag == ins_tag:
             ins_count += 1
-        elif elem.tag == qn("del"):
+        elif tag == del_tag:
             del_count += 1
-    return ins_count, del_count
+        else:
+            continue
+        raw = elem.get(id_attr)
+        if raw is None:
+            continue
+        try:
+            value = int(raw)
+        except ValueError:
+            continue
+        if max_change_id is None or value > max_change_id:
+            max_change_id = value
+    return DocumentStats(max_change_id=max_change_id, ins_count=ins_count, del_count=del_count)
 
 
 def make_regular_run(parent: ET.Element, text: str) -> None:
-    r = ET.SubElement(parent, qn("r"))
-    r_pr = ET.SubElement(r, qn("rPr"))
-    ET.SubElement(
+    r = sub_element(parent, qn("r"))
+    r_pr = sub_element(r, qn("rPr"))
+    sub_element(
         r_pr,
         qn("rFonts"),
         {qn("ascii"): "Times New Roman", qn("hAnsi"): "Times New Roman", qn("cs"): "Times New Roman"},
     )
-    t = ET.SubElement(r, qn("t"))
+    t = sub_element(r, qn("t"))
     if text.startswith(" ") or text.endswith(" ") or "  " in text:
         t.set(XML_SPACE, "preserve")
     t.text = text
 
 
 def make_footnote_ref_run(parent: ET.Element, footnote_id: int) -> None:
-    r = ET.SubElement(parent, qn("r"))
-    r_pr = ET.SubElement(r, qn("rPr"))
-    ET.SubElement(r_pr, qn("rStyle"), {qn("val"): "af9"})
-    ET.SubElement(
+    r = sub_element(parent, qn("r"))
+    r_pr = sub_element(r, qn("rPr"))
+    sub_element(r_pr, qn("rStyle"), {qn("val"): "af9"})
+    sub_element(
         r_pr,
         qn("rFonts"),
         {qn("ascii"): "Times New Roman", qn("hAnsi"): "Times New Roman", qn("cs"): "Times New Roman"},
     )
-    ET.SubElement(r, qn("footnoteReference"), {qn("id"): str(footnote_id)})
+    sub_element(r, qn("footnoteReference"), {qn("id"): str(footnote_id)})
 
 
 def apply_tracked_replacement(
@@ -371,23 +500,23 @@ def apply_tracked_replacement(
     del_id = change_id_start
     ins_id = change_id_start + 1
 
-    deleted = ET.SubElement(
+    deleted = sub_element(
         paragraph,
         qn("del"),
         {qn("id"): str(del_id), qn("author"): author, qn("date"): date_iso},
     )
-    del_run = ET.SubElement(deleted, qn("r"))
-    del_rpr = ET.SubElement(del_run, qn("rPr"))
-    ET.SubElement(
+    del_run = sub_element(deleted, qn("r"))
+    del_rpr = sub_element(del_run, qn("rPr"))
+    sub_element(
         del_rpr,
         qn("rFonts"),
         {qn("ascii"): "Times New Roman", qn("hAnsi"): "Times New Roman", qn("cs"): "Times New Roman"},
     )
-    del_text = ET.SubElement(del_run, qn("delText"))
+    del_text = sub_element(del_run, qn("delText"))
     del_text.set(XML_SPACE, "preserve")
     del_text.text = old
 
-    inserted = ET.SubElement(
+    inserted = sub_element(
         paragraph,
         qn("ins"),
         {qn("id"): str(ins_id), qn("author"): author, qn("date"): date_iso},
@@ -406,26 +535,152 @@ def apply_tracked_replacement(
     return change_id_start + 2
 
 
-def load_xml_from_docx(docx_path: Path, member: str) -> ET.Element:
-    with zipfile.ZipFile(docx_path, "r") as zf:
-        return ET.fromstring(zf.read(member))
+AUDIT_FIELDS = [
+    "Patch_Label",
+    "Question",
+    "Reason_One_Sentence",
+    "Source_Refs",
+    "Source_Footnote_IDs",
+    "Source_Details",
+]
+
+
+class RevisionAborted(Exception):
+    """Revision refused before any output was written; exit_code mirrors the CLI contract."""
+
+    def __init__(self, message: str, exit_code: int) -> None:
+        super().__init__(message)
+        self.exit_code = exit_code
+
+
+@dataclass
+class RevisionResult:
+    applied_labels: List[str]
+    new_footnote_ids: Dict[str, int]
+    audit_rows: List[Dict[str, str]]
+
+
+def revise_package(
+    package: DocxPackage,
+    patches: List[ParagraphPatch],
+    source_texts: Dict[str, str],
+    author: str,
+    date_iso: str,
+    allow_incremental: bool = False,
+) -> RevisionResult:
+    """Apply patches in place to the cached document/footnotes trees of package."""
+    document_root = package.part(DOCUMENT_PART)
+    footnotes_root = package.part(FOOTNOTES_PART)
+
+    fn_stats = scan_footnotes(footnotes_root)
+    doc_stats = scan_document(document_root)
+    assert_patch_policy(patches, source_texts, fn_stats.ids)
+
+    if (doc_stats.ins_count > 0 or doc_stats.del_count > 0) and not allow_incremental:
+        raise RevisionAborted(
+            "Input DOCX already contains tracked revisions "
+            f"(w:ins={doc_stats.ins_count}, w:del={doc_stats.del_count}). "
+            "For full re-cut, use original clean baseline DOCX. "
+            "If you intentionally want incremental patching, pass --allow-incremental.",
+            exit_code=3,
+        )
+
+    used_keys = collect_used_footnote_keys(patches, source_texts)
+    next_fn_id = fn_stats.max_id + 1
+    new_fn_id_map: Dict[str, int] = {}
+    for key in used_keys:
+        new_fn_id_map[key] = next_fn_id
+        add_footnote(footnotes_root, next_fn_id, source_texts[key])
+        next_fn_id += 1
+
+    body = document_root.find(qn("body"))
+    if body is None:
+        raise RevisionAborted("Invalid document.xml: missing w:body", exit_code=1)
+    index = ParagraphIndex(body.findall(qn("p")), patches)
+
+    cursor_change_id = doc_stats.next_change_id
+    applied_labels: List[str] = []
+    audit_rows: List[Dict[str, str]] = []
+
+    for patch in patches:
+        target, target_idx, question_text = _find_patch_target(index, patch)
+        tokens = tokenize_replacement(patch.replacement)
+        cursor_change_id = apply_tracked_replacement(
+            paragraph=target,
+            new_tokens=tokens,
+            new_footnote_id_map=new_fn_id_map,
+            change_id_start=cursor_change_id,
+            author=author,
+            date_iso=date_iso,
+        )
+        index.refresh(target_idx)
+        applied_labels.append(patch.label)
+
+        source_refs: List[str] = []
+        source_ids: List[str] = []
+        source_details: List[str] = []
+        for kind, value in tokens:
+            if kind == "footnote_new":
+                source_refs.append(f"fn:{value}")
+                source_ids.append(str(new_fn_id_map[value]))
+                source_details.append(source_texts[value])
+            elif kind == "footnote_existing":
+                fid = int(value)
+                source_refs.append(f"fnid:{fid}")
+                source_ids.append(str(fid))
+                source_details.append(fn_stats.text_map.get(fid, ""))
+
+        audit_rows.append(
+            {
+                "Patch_Label": patch.label,
+                "Question": question_text,
+                "Reason_One_Sentence": patch.reason,
+                "Source_Refs": ",".join(source_refs),
+                "Source_Footnote_IDs": ",".join(source_ids),
+                "Source_Details": " | ".join([d for d in source_details if d]),
+            }
+        )
+
+    return RevisionResult(
+        applied_labels=applied_labels,
+        new_footnote_ids={k: new_fn_id_map[k] for k in used_keys},
+        audit_rows=audit_rows,
+    )
+
+
+def write_audit_csv(path: Path, rows: Iterable[Dict[str, str]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.DictWriter(f, fieldnames=AUDIT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
 
 
-def write_docx_with_replacements(
-    source_docx: Path,
+def revise_docx_file(
+    input_docx: Path,
     output_docx: Path,
-    document_xml: ET.Element,
-    footnotes_xml: ET.Element,
-) -> None:
-    with zipfile.ZipFile(source_docx, "r") as zin:
-        with zipfile.ZipFile(output_docx, "w", compression=zipfile.ZIP_DEFLATED) as zout:
-            for info in zin.infolist():
-                data = zin.read(info.filename)
-                if info.filename == "word/document.xml":
-                    data = ET.tostring(document_xml, encoding="utf-8", xml_declaration=True)
-                elif info.filename == "word/footnotes.xml":
-                    data = ET.tostring(footnotes_xml, encoding="utf-8", xml_declaration=True)
-                zout.writestr(info, data)
+    patch_spec: Path,
+    audit_csv: Path,
+    author: str,
+    date_iso: str,
+    allow_incremental: bool = False,
+    xml_backend: str | None = None,
+) -> RevisionResult:
+    """File-to-file revision: patch spec + input DOCX -> revised DOCX + change audit CSV."""
+    patches, source_texts = load_patch_spec(patch_spec)
+    with DocxPackage(input_docx, backend=get_xml_backend(xml_backend)) as package:
+        result = revise_package(
+            package,
+            patches,
+            source_texts,
+            author=author,
+            date_iso=date_iso,
+            allow_incremental=allow_incremental,
+        )
+        output_docx.parent.mkdir(parents=True, exist_ok=True)
+        package.save(output_docx, [DOCUMENT_PART, FOOTNOTES_PART])
+    write_audit_csv(audit_csv, result.audit_rows)
+    return result
 
 
 def main() -> int:
@@ -459,6 +714,13 @@ def main() -> int:
         default=dt.datetime.now(dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z"),
         help="Revision timestamp in ISO-8601, e.g. 2026-02-12T12:00:00Z",
     )
+    parser.add_argument(
+        "--xml-backend",
+        choices=BACKEND_CHOICES,
+        default=default_backend_name(),
+        help="XML parser/serializer: lxml when installed (auto), or force lxml/stdlib. "
+        "Can also be set via REVISE_XML_BACKEND env var.",
+    )
     args = parser.parse_args()
 
     if args.run_id is not None and not is_valid_run_id(args.run_id):
@@ -484,109 +746,30 @@ def main() -> int:
     else:
         audit_csv = args.output_docx.with_name(f"{args.output_docx.stem}_change_audit.csv")
 
-    patches, source_texts = load_patch_spec(args.patch_spec)
-
-    document_root = load_xml_from_docx(args.input_docx, "word/document.xml")
-    footnotes_root = load_xml_from_docx(args.input_docx, "word/footnotes.xml")
-
-    existing_ids = existing_footnote_ids(footnotes_root)
-    existing_text_map = footnote_text_map(footnotes_root)
-    assert_patch_policy(patches, source_texts, existing_ids)
-
-    ins_count, del_count = tracked_change_counts(document_root)
-    if (ins_count > 0 or del_count > 0) and not args.allow_incremental:
-        print(
-            "Input DOCX already contains tracked revisions "
-            f"(w:ins={ins_count}, w:del={del_count}). "
-            "For full re-cut, use original clean baseline DOCX. "
-            "If you intentionally want incremental patching, pass --allow-incremental.",
-            file=sys.stderr,
-        )
-        return 3
-
-    used_keys = collect_used_footnote_keys(patches, source_texts)
-    next_fn_id = max_footnote_id(footnotes_root) + 1
-    new_fn_id_map: Dict[str, int] = {}
-    for key in used_keys:
-        new_fn_id_map[key] = next_fn_id
-        add_footnote(footnotes_root, next_fn_id, source_texts[key])
-        next_fn_id += 1
-
-    body = document_root.find(qn("body"))
-    if body is None:
-        print("Invalid document.xml: missing w:body", file=sys.stderr)
-        return 1
-    paragraphs = [p for p in body.findall(qn("p"))]
-
-    cursor_change_id = next_change_id(document_root)
-    applied_labels: List[str] = []
-    audit_rows: List[Dict[str, str]] = []
-
-    for patch in patches:
-        target, _target_idx, question_text = _find_patch_target(paragraphs, patch)
-        tokens = tokenize_replacement(patch.replacement)
-        cursor_change_id = apply_tracked_replacement(
-            paragraph=target,
-            new_tokens=tokens,
-            new_footnote_id_map=new_fn_id_map,
-            change_id_start=cursor_change_id,
+    try:
+        result = revise_docx_file(
+            input_docx=args.input_docx,
+            output_docx=args.output_docx,
+            patch_spec=args.patch_spec,
+            audit_csv=audit_csv,
             author=args.author,
             date_iso=args.date,
+            allow_incremental=args.allow_incremental,
+            xml_backend=args.xml_backend,
         )
-        applied_labels.append(patch.label)
-
-        source_refs: List[str] = []
-        source_ids: List[str] = []
-        source_details: List[str] = []
-        for kind, value in tokens:
-            if kind == "footnote_new":
-                source_refs.append(f"fn:{value}")
-                source_ids.append(str(new_fn_id_map[value]))
-                source_details.append(source_texts[value])
-            elif kind == "footnote_existing":
-                fid = int(value)
-                source_refs.append(f"fnid:{fid}")
-                source_ids.append(str(fid))
-                source_details.append(existing_text_map.get(fid, ""))
-
-        audit_rows.append(
-            {
-                "Patch_Label": patch.label,
-                "Question": question_text,
-                "Reason_One_Sentence": patch.reason,
-                "Source_Refs": ",".join(source_refs),
-                "Source_Footnote_IDs": ",".join(source_ids),
-                "Source_Details": " | ".join([d for d in source_details if d]),
-            }
-        )
-
-    write_docx_with_replacements(args.input_docx, args.output_docx, document_root, footnotes_root)
-
-    audit_csv.parent.mkdir(parents=True, exist_ok=True)
-    with audit_csv.open("w", newline="", encoding="utf-8-sig") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=[
-                "Patch_Label",
-                "Question",
-                "Reason_One_Sentence",
-                "Source_Refs",
-                "Source_Footnote_IDs",
-                "Source_Details",
-            ],
-        )
-        writer.writeheader()
-        writer.writerows(audit_rows)
+    except RevisionAborted as exc:
+        print(str(exc), file=sys.stderr)
+        return exc.exit_code
 
     if args.copy_to is not None:
         args.copy_to.parent.mkdir(parents=True, exist_ok=True)
         shutil.copy2(args.output_docx, args.copy_to)
 
-    print("Applied patches:", ", ".join(applied_labels))
+    print("Applied patches:", ", ".join(result.applied_labels))
     print("Output:", args.output_docx)
     if args.copy_to:
         print("Copy:", args.copy_to)
-    print("New footnotes:", {k: new_fn_id_map[k] for k in used_keys})
+    print("New footnotes:", result.new_footnote_ids)
     print("Change audit:", audit_csv)
     return 0
 
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Batch DOCX revision: apply many (input DOCX, patch spec, output DOCX) jobs in one process.
+
+Jobs come from a CSV or JSONL manifest and run across a process pool. Each job writes
+its own revised DOCX and change-audit CSV exactly like revise_docx.py; a batch summary
+CSV records the outcome of every job in manifest order.
+
+Manifest fields (relative paths resolve against the manifest's directory):
+- input_docx (required)
+- patch_spec (required)
+- output_docx (required)
+- audit_csv (optional, default: <output>_change_audit.csv)
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import datetime as dt
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+from revise_docx import RevisionAborted, revise_docx_file
+from xml_backend import BACKEND_CHOICES, default_backend_name
+
+
+MANIFEST_FIELDS = ["input_docx", "patch_spec", "output_docx"]
+SUMMARY_FIELDS = [
+    "job",
+    "input_docx",
+    "patch_spec",
+    "output_docx",
+    "audit_csv",
+    "status",
+    "exit_code",
+    "applied_patches",
+    "detail",
+]
+
+
+def _resolve(base: Path, raw: str) -> Path:
+    path = Path(raw).expanduser()
+    return (path if path.is_absolute() else base / path).resolve()
+
+
+def load_manifest(path: Path) -> List[Dict[str, str]]:
+    base = path.resolve().parent
+    if path.suffix.lower() == ".jsonl":
+        items = []
+        for lineno, line in enumerate(path.read_text(encoding="utf-8").splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"Manifest line {lineno} is not valid JSON: {exc}") from exc
+            if not isinstance(item, dict):
+                raise ValueError(f"Manifest line {lineno} must be a JSON object")
+            items.append(item)
+    elif path.suffix.lower() == ".csv":
+        with path.open("r", newline="", encoding="utf-8-sig") as f:
+            items = list(csv.DictReader(f))
+    else:
+        raise ValueError(f"Unsupported manifest format (expected .csv or .jsonl): {path}")
+
+    jobs: List[Dict[str, str]] = []
+    seen_outputs = set()
+    for job_no, item in enumerate(items, start=1):
+        missing = [k for k in MANIFEST_FIELDS if not str(item.get(k) or "").strip()]
+        if missing:
+            raise ValueError(f"Manifest job {job_no} is missing field(s): {', '.join(missing)}")
+        output_docx = _resolve(base, str(item["output_docx"]).strip())
+        if item.get("audit_csv"):
+            audit_csv = _resolve(base, str(item["audit_csv"]).strip())
+        else:
+            audit_csv = output_docx.with_name(f"{output_docx.stem}_change_audit.csv")
+        for target in (output_docx, audit_csv):
+            if target.resolve() in seen_outputs:
+                raise ValueError(f"Manifest job {job_no} reuses output path: {target}")
+            seen_outputs.add(target.resolve())
+        jobs.append(
+            {
+                "job": str(job_no),
+                "input_docx": str(_resolve(base, str(item["input_docx"]).strip())),
+                "patch_spec": str(_resolve(base, str(item["patch_spec"]).strip())),
+                "output_docx": str(output_docx),
+                "audit_csv": str(audit_csv),
+            }
+        )
+    return jobs
+
+
+def _run_job(job: Dict[str, str], author: str, date_iso: str, allow_incremental: bool, xml_backend: str) -> Dict[str, str]:
+    row = dict(job)
+    row.update({"status": "FAILED", "exit_code": "1", "applied_patches": "", "detail": ""})
+    if not Path(job["input_docx"]).exists():
+        row["detail"] = f"Input docx not found: {job['input_docx']}"
+        return row
+    if not Path(job["patch_spec"]).exists():
+        row["detail"] = f"Patch spec not found: {job['patch_spec']}"
+        return row
+    try:
+        result = revise_docx_file(
+            input_docx=Path(job["input_docx"]),
+            output_docx=Path(job["output_docx"]),
+            patch_spec=Path(job["patch_spec"]),
+            audit_csv=Path(job["audit_csv"]),
+            author=author,
+            date_iso=date_iso,
+            allow_incremental=allow_incremental,
+            xml_backend=xml_backend,
+        )
+    except RevisionAborted as exc:
+        row.update({"status": "REFUSED", "exit_code": str(exc.exit_code), "detail": str(exc)})
+        return row
+    except Exception as exc:
+        row["detail"] = f"{exc.__class__.__name__}: {exc}"
+        return row
+    row.update(
+        {
+            "status": "SUCCEEDED",
+            "exit_code": "0",
+            "applied_patches": ",".join(result.applied_labels),
+        }
+    )
+    return row
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Apply tracked revisions to many DOCX files in one process.")
+    parser.add_argument("--manifest", required=True, type=Path, help="CSV or JSONL list of revision jobs.")
+    parser.add_argument(
+        "--summary-csv",
+        type=Path,
+        default=None,
+        help="Batch outcome table. Default: <manifest>_summary.csv",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes (default: CPU count). 1 runs jobs serially in this process.",
+    )
+    parser.add_argument(
+        "--allow-incremental",
+        action="store_true",
+        help="Allow input DOCX files that already contain tracked revisions (w:ins/w:del).",
+    )
+    parser.add_argument("--author", default="Codex")
+    parser.add_argument(
+        "--date",
+        default=dt.datetime.now(dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z"),
+        help="Revision timestamp in ISO-8601 applied to every job, e.g. 2026-02-12T12:00:00Z",
+    )
+    parser.add_argument(
+        "--xml-backend",
+        choices=BACKEND_CHOICES,
+        default=default_backend_name(),
+        help="XML parser/serializer: lxml when installed (auto), or force lxml/stdlib.",
+    )
+    args = parser.parse_args()
+
+    if args.workers < 1:
+        parser.error("--workers must be >= 1")
+    if not args.manifest.exists():
+        print(f"Manifest not found: {args.manifest}", file=sys.stderr)
+        return 1
+    summary_csv = args.summary_csv or args.manifest.with_name(f"{args.manifest.stem}_summary.csv")
+
+    try:
+        jobs = load_manifest(args.manifest)
+    except ValueError as exc:
+        print(f"Invalid manifest {args.manifest}: {exc}", file=sys.stderr)
+        return 1
+    job_args = (args.author, args.date, args.allow_incremental, args.xml_backend)
+    if args.workers == 1 or len(jobs) <= 1:
+        rows = [_run_job(job, *job_args) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(args.workers, len(jobs))) as pool:
+            futures = [pool.submit(_run_job, job, *job_args) for job in jobs]
+            rows = [f.result() for f in futures]
+
+    summary_csv.parent.mkdir(parents=True, exist_ok=True)
+    with summary_csv.open("w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    failed = [r for r in rows if r["status"] != "SUCCEEDED"]
+    for row in failed:
+        print(f"Job {row['job']} {row['status']}: {row['detail']}", file=sys.stderr)
+    print(f"Jobs: {len(rows)} succeeded: {len(rows) - len(failed)} failed: {len(failed)}")
+    print(f"Summary: {summary_csv}")
+    return 0 if not failed else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
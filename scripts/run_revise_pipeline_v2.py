@@ -11,8 +11,9 @@ import json
 import os
 import subprocess
 import sys
+import traceback
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Callable, Dict, List
 
 from run_artifact_utils import (
     ArtifactRecord,
@@ -30,6 +31,13 @@ from run_artifact_utils import (
 )
 from update_run_index import upsert_run_record
 
+import check_revise_sources
+from build_q_source_map import build_q_map_rows, write_q_map_csv
+from docx_package import DOCUMENT_PART, FOOTNOTES_PART, DocxPackage
+from openrevise.api import revise
+from revise_docx import RevisionAborted, write_audit_csv
+from xml_backend import BACKEND_CHOICES, default_backend_name, get_xml_backend
+
 
 SYNC_FIELDS = [
     "marker",
@@ -55,6 +63,7 @@ ARTIFACT_FIELDS = [
 ]
 
 POLICY_NAME = "hot30_cold180"
+STAGE_MODES = ["inprocess", "subprocess"]
 
 
 def _run(cmd: List[str]) -> int:
@@ -63,6 +72,71 @@ def _run(cmd: List[str]) -> int:
     return proc.returncode
 
 
+def _run_inprocess(label: str, fn: Callable[[], int]) -> int:
+    """Run one stage in this interpreter, mapping failures to the exit code the script would return."""
+    print("+ (in-process)", label)
+    sys.stdout.flush()
+    try:
+        return fn()
+    except SystemExit as exc:
+        return exc.code if isinstance(exc.code, int) else 1
+    except Exception:
+        traceback.print_exc()
+        return 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+
+def _revise_inprocess(
+    input_docx: Path,
+    patch_spec: Path,
+    output_docx: Path,
+    audit_csv: Path,
+    author: str,
+    date_iso: str,
+    allow_incremental: bool,
+    xml_backend: str,
+    handoff: Dict[str, Any],
+) -> int:
+    """In-process revise_docx: keeps the revised part trees in handoff for the Q-map stage."""
+    try:
+        result = revise(
+            input_docx,
+            patch_spec,
+            author=author,
+            date=date_iso,
+            allow_incremental=allow_incremental,
+            xml_backend=xml_backend,
+        )
+    except RevisionAborted as exc:
+        print(str(exc), file=sys.stderr)
+        return exc.exit_code
+    output_docx.parent.mkdir(parents=True, exist_ok=True)
+    output_docx.write_bytes(result.docx_bytes)
+    handoff[DOCUMENT_PART] = result.document_root
+    handoff[FOOTNOTES_PART] = result.footnotes_root
+    write_audit_csv(audit_csv, result.audit_rows)
+    print("Applied patches:", ", ".join(result.applied_labels))
+    print("Output:", output_docx)
+    print("New footnotes:", result.new_footnote_ids)
+    print("Change audit:", audit_csv)
+    return 0
+
+
+def _qmap_inprocess(revised_docx: Path, output_csv: Path, xml_backend: str, handoff: Dict[str, Any]) -> int:
+    """In-process build_q_source_map: uses the revised trees from the revise stage when available."""
+    if DOCUMENT_PART in handoff and FOOTNOTES_PART in handoff:
+        rows = build_q_map_rows(handoff[DOCUMENT_PART], handoff[FOOTNOTES_PART])
+    else:
+        with DocxPackage(revised_docx, backend=get_xml_backend(xml_backend)) as package:
+            rows = build_q_map_rows(package.part(DOCUMENT_PART), package.part(FOOTNOTES_PART))
+    write_q_map_csv(output_csv, rows)
+    print(f"Q count: {len(rows)}")
+    print(f"Output: {output_csv}")
+    return 0
+
+
 def _acquire_single_run_lock(lock_path: Path) -> int | None:
     lock_path.parent.mkdir(parents=True, exist_ok=True)
     try:
@@ -162,6 +236,81 @@ def _parse_args() -> argparse.Namespace:
         action="store_true",
         help="Disable TLS certificate verification for source checks (diagnostic use only).",
     )
+    parser.add_argument(
+        "--http-cache-dir",
+        type=Path,
+        default=None,
+        help="Persistent HTTP cache for source-gate downloads (default: check_revise_sources.py default).",
+    )
+    parser.add_argument(
+        "--no-http-cache",
+        action="store_true",
+        help="Download every remote source in full for this run.",
+    )
+    parser.add_argument(
+        "--text-cache-dir",
+        type=Path,
+        default=None,
+        help="Persistent PDF text cache for the source gate (default: check_revise_sources.py default).",
+    )
+    parser.add_argument(
+        "--no-text-cache",
+        action="store_true",
+        help="Re-extract all PDF text for this run.",
+    )
+    parser.add_argument(
+        "--pdf-workers",
+        type=int,
+        default=None,
+        help="Processes for PDF page extraction in the source gate (default: check_revise_sources.py default).",
+    )
+    parser.add_argument(
+        "--max-download-mb",
+        type=float,
+        default=None,
+        help="Size limit for each remote source download in the source gate (default: check_revise_sources.py default).",
+    )
+    parser.add_argument(
+        "--remote-pdf-mode",
+        choices=["download", "range"],
+        default=None,
+        help="How the source gate reads remote PDFs (default: check_revise_sources.py default).",
+    )
+    parser.add_argument(
+        "--pdf-page-limit",
+        type=int,
+        default=None,
+        help="Check only the first N pages of each PDF source in the gate.",
+    )
+    parser.add_argument(
+        "--gate-deadline",
+        type=float,
+        default=None,
+        help="Hard time limit in seconds for the source gate; pending sources are reported timed_out.",
+    )
+    parser.add_argument(
+        "--gate-cache-dir",
+        type=Path,
+        default=None,
+        help="Gate result store reused across runs (default: check_revise_sources.py default).",
+    )
+    parser.add_argument(
+        "--no-gate-cache",
+        action="store_true",
+        help="Re-check every source instead of reusing gate results from earlier runs.",
+    )
+    snapshot_group = parser.add_mutually_exclusive_group()
+    snapshot_group.add_argument(
+        "--record-snapshot",
+        action="store_true",
+        help="Record every gate source into reports/source_snapshot_<run_id>.zip for offline re-validation.",
+    )
+    snapshot_group.add_argument(
+        "--replay-snapshot",
+        type=Path,
+        default=None,
+        help="Run the source gate from a recorded snapshot zip (no network).",
+    )
     parser.add_argument(
         "--allow-incremental",
         action="store_true",
@@ -173,6 +322,20 @@ def _parse_args() -> argparse.Namespace:
         default=None,
         help="Optional extra copy destination for revised DOCX.",
     )
+    parser.add_argument(
+        "--stage-mode",
+        choices=STAGE_MODES,
+        default="inprocess",
+        help="Run gate/revise/Q-map stages in this interpreter (default, artifacts handed over in memory) "
+        "or as isolated subprocesses.",
+    )
+    parser.add_argument(
+        "--xml-backend",
+        choices=BACKEND_CHOICES,
+        default=default_backend_name(),
+        help="XML parser/serializer for the revise and Q-map stages: lxml when installed (auto), "
+        "or force lxml/stdlib. Can also be set via REVISE_XML_BACKEND env var.",
+    )
     return parser.parse_args()
 
 
@@ -224,6 +387,7 @@ def main() -> int:
 
     intake_copy = run_dir / "intake" / f"input_{run_id}.docx"
     source_report = run_dir / "reports" / f"source_gate_report_{run_id}.json"
+    source_snapshot = run_dir / "reports" / f"source_snapshot_{run_id}.zip"
     run_context_file = run_dir / "reports" / f"run_context_{run_id}.json"
     revised_docx = run_dir / "revision" / f"revised_{run_id}.docx"
     revision_audit = run_dir / "revision" / f"revision_change_audit_{run_id}.csv"
@@ -287,67 +451,114 @@ def main() -> int:
         )
 
         finished_status = "SUCCEEDED"
-        source_check_rc = _run(
-            [
-                sys.executable,
-                str(scripts_dir / "check_revise_sources.py"),
-                "--config",
-                str(args.source_config),
-                "--output-json",
-                str(source_report),
-                "--run-dir",
-                str(run_dir),
-                "--run-id",
-                run_id,
-            ]
-            + (["--ca-bundle", str(args.ca_bundle)] if args.ca_bundle is not None else [])
-            + (["--allow-insecure-tls"] if args.allow_insecure_tls else [])
-        )
+        gate_args = [
+            "--config",
+            str(args.source_config),
+            "--output-json",
+            str(source_report),
+            "--run-dir",
+            str(run_dir),
+            "--run-id",
+            run_id,
+            # The audited run always scans every source completely (no early exit).
+            "--full-traversal",
+        ]
+        gate_args += ["--ca-bundle", str(args.ca_bundle)] if args.ca_bundle is not None else []
+        gate_args += ["--allow-insecure-tls"] if args.allow_insecure_tls else []
+        gate_args += ["--http-cache-dir", str(args.http_cache_dir)] if args.http_cache_dir is not None else []
+        gate_args += ["--no-http-cache"] if args.no_http_cache else []
+        gate_args += ["--text-cache-dir", str(args.text_cache_dir)] if args.text_cache_dir is not None else []
+        gate_args += ["--no-text-cache"] if args.no_text_cache else []
+        gate_args += ["--pdf-workers", str(args.pdf_workers)] if args.pdf_workers is not None else []
+        gate_args += ["--max-download-mb", str(args.max_download_mb)] if args.max_download_mb is not None else []
+        gate_args += ["--remote-pdf-mode", args.remote_pdf_mode] if args.remote_pdf_mode is not None else []
+        gate_args += ["--pdf-page-limit", str(args.pdf_page_limit)] if args.pdf_page_limit is not None else []
+        gate_args += ["--deadline", str(args.gate_deadline)] if args.gate_deadline is not None else []
+        gate_args += ["--gate-cache-dir", str(args.gate_cache_dir)] if args.gate_cache_dir is not None else []
+        gate_args += ["--no-gate-cache"] if args.no_gate_cache else []
+        gate_args += ["--record-snapshot", str(source_snapshot)] if args.record_snapshot else []
+        gate_args += ["--replay-snapshot", str(args.replay_snapshot)] if args.replay_snapshot is not None else []
+        inprocess = args.stage_mode == "inprocess"
+        handoff: Dict[str, Any] = {}
+
+        if inprocess:
+            source_check_rc = _run_inprocess(
+                "check_revise_sources.py " + " ".join(gate_args),
+                lambda: check_revise_sources.main(gate_args),
+            )
+        else:
+            source_check_rc = _run([sys.executable, str(scripts_dir / "check_revise_sources.py")] + gate_args)
         if source_check_rc != 0 and not args.allow_required_fail:
             finished_status = "FAILED_GATE"
             finished_notes = "required source gate failed"
         else:
-            revise_cmd = [
-                sys.executable,
-                str(scripts_dir / "revise_docx.py"),
-                "--input-docx",
-                str(intake_copy),
-                "--output-docx",
-                str(revised_docx),
-                "--audit-csv",
-                str(revision_audit),
-                "--patch-spec",
-                str(patch_spec_copy),
-                "--author",
-                args.author,
-                "--date",
-                args.date,
-                "--run-dir",
-                str(run_dir),
-                "--run-id",
-                run_id,
-            ]
-            if args.allow_incremental:
-                revise_cmd.append("--allow-incremental")
-            revise_rc = _run(revise_cmd)
+            if inprocess:
+                revise_rc = _run_inprocess(
+                    f"revise_docx.py {intake_copy} -> {revised_docx}",
+                    lambda: _revise_inprocess(
+                        input_docx=intake_copy,
+                        patch_spec=patch_spec_copy,
+                        output_docx=revised_docx,
+                        audit_csv=revision_audit,
+                        author=args.author,
+                        date_iso=args.date,
+                        allow_incremental=args.allow_incremental,
+                        xml_backend=args.xml_backend,
+                        handoff=handoff,
+                    ),
+                )
+            else:
+                revise_cmd = [
+                    sys.executable,
+                    str(scripts_dir / "revise_docx.py"),
+                    "--input-docx",
+                    str(intake_copy),
+                    "--output-docx",
+                    str(revised_docx),
+                    "--audit-csv",
+                    str(revision_audit),
+                    "--patch-spec",
+                    str(patch_spec_copy),
+                    "--author",
+                    args.author,
+                    "--date",
+                    args.date,
+                    "--run-dir",
+                    str(run_dir),
+                    "--run-id",
+                    run_id,
+                    "--xml-backend",
+                    args.xml_backend,
+                ]
+                if args.allow_incremental:
+                    revise_cmd.append("--allow-incremental")
+                revise_rc = _run(revise_cmd)
             if revise_rc != 0:
                 finished_status = "FAILED_REVISE"
                 finished_notes = f"revise_docx failed with code {revise_rc}"
             else:
-                qmap_rc = _run(
-                    [
-                        sys.executable,
-                        str(scripts_dir / "build_q_source_map.py"),
-                        "--input-docx",
-                        str(revised_docx),
-                        "--output-csv",
-                        str(q_source_map),
-                        "--run-dir",
-                        str(run_dir),
-                        "--run-id",
-                        run_id,
-                    ]
-                )
+                if inprocess:
+                    qmap_rc = _run_inprocess(
+                        f"build_q_source_map.py {revised_docx} -> {q_source_map}",
+                        lambda: _qmap_inprocess(revised_docx, q_source_map, args.xml_backend, handoff),
+                    )
+                else:
+                    qmap_rc = _run(
+                        [
+                            sys.executable,
+                            str(scripts_dir / "build_q_source_map.py"),
+                            "--input-docx",
+                            str(revised_docx),
+                            "--output-csv",
+                            str(q_source_map),
+                            "--run-dir",
+                            str(run_dir),
+                            "--run-id",
+                            run_id,
+                            "--xml-backend",
+                            args.xml_backend,
+                        ]
+                    )
                 if qmap_rc != 0:
                     finished_status = "FAILED_QMAP"
                     finished_notes = f"build_q_source_map failed with code {qmap_rc}"
@@ -451,6 +662,50 @@ def main() -> int:
             "HOT",
             "source_gate_report",
         )
+        add_artifact(
+            "source_snapshot",
+            source_snapshot,
+            "gate",
+            "check_revise_sources.py",
+            str(args.source_config),
+            "PERMANENT",
+            "source_snapshot",
+        )
+        for raw_source in sorted((run_dir / "sources_raw").iterdir()):
+            add_artifact(
+                "source_raw",
+                raw_source,
+                "gate",
+                "check_revise_sources.py",
+                str(args.source_config),
+                "HOT",
+                "source_raw",
+            )
+        for parsed_source in sorted((run_dir / "sources_parsed").iterdir()):
+            add_artifact(
+                "source_parsed_text",
+                parsed_source,
+                "gate",
+                "check_revise_sources.py",
+                str(args.source_config),
+                "HOT",
+                "source_parsed_text",
+            )
+        # A memoized check whose text could not be rebuilt points at the producing run's file.
+        gate_results = (
+            json.loads(source_report.read_text(encoding="utf-8")).get("results", []) if source_report.exists() else []
+        )
+        for result in gate_results:
+            if result.get("parsed_run_id"):
+                add_artifact(
+                    "source_parsed_text_ref",
+                    Path(result["parsed_path"]),
+                    "gate",
+                    "check_revise_sources.py",
+                    str(result["parsed_run_id"]),
+                    "HOT",
+                    "source_parsed_text",
+                )
         add_artifact(
             "revised_docx",
             revised_docx,
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Persistent, content-addressed HTTP cache for source gate fetches.
+
+Layout under the cache root:
+- objects/<sha[:2]>/<sha256>   response bodies, stored once per distinct content
+- index/<sha256(url)>.json     per-URL entry: body hash plus ETag / Last-Modified validators
+
+Entries are revalidated with conditional GETs; a 304 reuses the stored body.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Dict
+
+from run_artifact_utils import to_iso_z, utc_now, write_atomic
+
+
+CACHE_DIR_ENV = "REVISE_HTTP_CACHE_DIR"
+
+
+def default_cache_dir() -> Path:
+    if os.environ.get(CACHE_DIR_ENV):
+        return Path(os.environ[CACHE_DIR_ENV])
+    return Path(__file__).resolve().parents[1] / "cache" / "http"
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    url: str
+    sha256: str
+    size: int
+    etag: str
+    last_modified: str
+    fetched_at: str
+    validated_at: str
+
+
+class HttpCache:
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+
+    def _index_path(self, url: str) -> Path:
+        return self.root / "index" / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def object_path(self, sha256: str) -> Path:
+        return self.root / "objects" / sha256[:2] / sha256
+
+    def lookup(self, url: str) -> CacheEntry | None:
+        """Cached entry for url, or None when missing, unreadable or its body object is gone."""
+        try:
+            entry = CacheEntry(**json.loads(self._index_path(url).read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            return None
+        if entry.url != url or not self.object_path(entry.sha256).is_file():
+            return None
+        return entry
+
+    @property
+    def spool_dir(self) -> Path:
+        """Directory for in-progress downloads (same filesystem, so adoption is a rename)."""
+        return self.root / "tmp"
+
+    @staticmethod
+    def conditional_headers(entry: CacheEntry) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def _write_entry(self, entry: CacheEntry) -> None:
+        write_atomic(self._index_path(entry.url), json.dumps(asdict(entry), indent=2).encode("utf-8") + b"\n")
+
+    def adopt(
+        self,
+        url: str,
+        path: Path,
+        sha256: str,
+        size: int,
+        etag: str = "",
+        last_modified: str = "",
+    ) -> CacheEntry:
+        """Move a fully downloaded body (hashed while streaming) into the store and index it."""
+        target = self.object_path(sha256)
+        if target.is_file():
+            path.unlink()
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            # Objects may be hardlinked into run directories; keep them immutable.
+            os.chmod(path, 0o444)
+            os.replace(path, target)
+        now = to_iso_z(utc_now())
+        entry = CacheEntry(
+            url=url,
+            sha256=sha256,
+            size=size,
+            etag=etag,
+            last_modified=last_modified,
+            fetched_at=now,
+            validated_at=now,
+        )
+        self._write_entry(entry)
+        return entry
+
+    def revalidated(self, entry: CacheEntry, etag: str = "", last_modified: str = "") -> CacheEntry:
+        """Record a 304 for entry, keeping any refreshed validators the server sent."""
+        updated = replace(
+            entry,
+            etag=etag or entry.etag,
+            last_modified=last_modified or entry.last_modified,
+            validated_at=to_iso_z(utc_now()),
+        )
+        self._write_entry(updated)
+        return updated
+
+    def materialize(self, sha256: str, dest: Path) -> None:
+        """Place a cached body at dest: hardlink when possible, otherwise copy."""
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if dest.exists():
+            dest.unlink()
+        try:
+            os.link(self.object_path(sha256), dest)
+        except OSError:
+            shutil.copyfile(self.object_path(sha256), dest)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Source snapshot bundles for recording and replaying source gate runs.
+
+A snapshot is one zip archive:
+- index.json          per-source entries keyed by locator (URL, or path for local PDFs)
+- bodies/<sha256>     fetched bodies (decoded), stored once per distinct content
+
+A recorded snapshot lets a later gate run re-validate the same evidence offline.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import zipfile
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Set
+
+from run_artifact_utils import to_iso_z, utc_now
+
+
+SNAPSHOT_FORMAT = 1
+INDEX_NAME = "index.json"
+
+
+@dataclass(frozen=True)
+class SnapshotEntry:
+    locator: str
+    # "url" for fetched sources, "file" for local PDFs.
+    kind: str
+    sha256: str
+    size: int
+    recorded_at: str
+    # HTTP status and response headers of the recorded fetch (empty for local files).
+    status: int = 0
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+def _body_name(sha256: str) -> str:
+    return f"bodies/{sha256}"
+
+
+class SnapshotRecorder:
+    """Collects source bodies during a gate run; the archive is written on close().
+
+    Safe to call from concurrent checks. Leaving a `with` block on an exception discards
+    the partial archive.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = self.path.with_name(f".{self.path.name}.part")
+        self._zip = zipfile.ZipFile(self._tmp_path, "w", compression=zipfile.ZIP_DEFLATED)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, SnapshotEntry] = {}
+        self._bodies: Set[str] = set()
+        self._closed = False
+
+    def __enter__(self) -> "SnapshotRecorder":
+        return self
+
+    def __exit__(self, exc_type: object, *exc: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def add(
+        self,
+        locator: str,
+        kind: str,
+        body_path: Path,
+        sha256: str,
+        size: int,
+        status: int = 0,
+        headers: Dict[str, str] | None = None,
+    ) -> None:
+        entry = SnapshotEntry(
+            locator=locator,
+            kind=kind,
+            sha256=sha256,
+            size=size,
+            recorded_at=to_iso_z(utc_now()),
+            status=status,
+            headers=dict(headers or {}),
+        )
+        with self._lock:
+            if self._closed:
+                raise ValueError(f"Snapshot already closed: {self.path}")
+            if sha256 not in self._bodies:
+                self._zip.write(body_path, _body_name(sha256))
+                self._bodies.add(sha256)
+            self._entries[locator] = entry
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            index = {
+                "format": SNAPSHOT_FORMAT,
+                "created_at": to_iso_z(utc_now()),
+                "sources": {
+                    locator: {k: v for k, v in asdict(entry).items() if k != "locator"}
+                    for locator, entry in sorted(self._entries.items())
+                },
+            }
+            self._zip.writestr(INDEX_NAME, json.dumps(index, ensure_ascii=False, indent=2) + "\n")
+            self._zip.close()
+            os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._zip.close()
+            self._tmp_path.unlink(missing_ok=True)
+
+
+class SourceSnapshot:
+    """Read side of a snapshot: serves recorded bodies without touching the network."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._zip = zipfile.ZipFile(self.path, "r")
+        try:
+            index = json.loads(self._zip.read(INDEX_NAME).decode("utf-8"))
+            if index.get("format") != SNAPSHOT_FORMAT:
+                raise ValueError(f"Unsupported snapshot format {index.get('format')!r} in {self.path}")
+            self._entries = {
+                locator: SnapshotEntry(locator=locator, **fields)
+                for locator, fields in index["sources"].items()
+            }
+        except (KeyError, TypeError, ValueError) as exc:
+            self._zip.close()
+            raise ValueError(f"Invalid source snapshot {self.path}: {exc}") from exc
+
+    def __enter__(self) -> "SourceSnapshot":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def lookup(self, locator: str) -> SnapshotEntry | None:
+        return self._entries.get(locator)
+
+    def extract(self, entry: SnapshotEntry, spool_dir: Path | None = None) -> Path:
+        """Copy entry's body to a new temporary file (caller removes it), verifying its sha256."""
+        if spool_dir is not None:
+            spool_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(
+            dir=str(spool_dir) if spool_dir is not None else None, prefix=".replay.", suffix=".part"
+        )
+        tmp = Path(tmp_name)
+        try:
+            digest = hashlib.sha256()
+            with os.fdopen(fd, "wb") as out, self._zip.open(_body_name(entry.sha256)) as body:
+                while True:
+                    chunk = body.read(1024 * 1024)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    out.write(chunk)
+            if digest.hexdigest() != entry.sha256:
+                raise ValueError(f"Snapshot body for {entry.locator} does not match its sha256")
+        except KeyError as exc:
+            tmp.unlink(missing_ok=True)
+            raise ValueError(f"Snapshot body for {entry.locator} is missing from {self.path}") from exc
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return tmp
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Shared multi-pattern text matching utilities.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton: find every occurrence of many patterns in one pass over a text."""
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self.patterns: List[str] = list(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            if not pattern:
+                raise ValueError("AhoCorasick patterns must be non-empty")
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._goto[state][ch] = nxt
+                state = nxt
+            self._out[state] = self._out[state] + (pattern_id,)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (start_offset, pattern_id) for every occurrence, ordered by end offset."""
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        patterns = self.patterns
+        state = 0
+        for pos, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pattern_id in out[state]:
+                yield pos + 1 - len(patterns[pattern_id]), pattern_id
+
+    def scanner(self) -> "AhoCorasickScanner":
+        return AhoCorasickScanner(self)
+
+
+class AhoCorasickScanner:
+    """Resumable scan of one text fed in pieces: the automaton state carries over, so
+    occurrences spanning two pieces are found. Offsets are relative to the whole text."""
+
+    def __init__(self, automaton: AhoCorasick) -> None:
+        self.automaton = automaton
+        self.state = 0
+        self.offset = 0
+
+    def feed(self, piece: str) -> List[Tuple[int, int]]:
+        """(start_offset, pattern_id) for every occurrence ending inside piece."""
+        goto = self.automaton._goto
+        fail = self.automaton._fail
+        out = self.automaton._out
+        patterns = self.automaton.patterns
+        state = self.state
+        base = self.offset + 1
+        matches: List[Tuple[int, int]] = []
+        for pos, ch in enumerate(piece):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pattern_id in out[state]:
+                matches.append((base + pos - len(patterns[pattern_id]), pattern_id))
+        self.state = state
+        self.offset += len(piece)
+        return matches
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Pluggable XML backend for DOCX parts: lxml when installed, xml.etree otherwise.
+
+Only parsing and serialization differ between backends. Scripts build new elements
+through `sub_element()` / `Element.makeelement()`, which both backends provide, so
+the same editing code runs on either tree type.
+
+Output equivalence: both backends serialize the same element tree (tags, attributes,
+text, tails, order). Byte differences are limited to namespace prefix declarations,
+the XML declaration's quoting/standalone flag, and comments/processing instructions,
+which xml.etree drops on parse while lxml preserves them from the source part.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+import xml.etree.ElementTree as ET
+
+
+BACKEND_ENV = "REVISE_XML_BACKEND"
+BACKEND_CHOICES = ["auto", "lxml", "stdlib"]
+
+
+@dataclass(frozen=True)
+class XmlBackend:
+    name: str
+    fromstring: Callable[[bytes], Any]
+    tostring: Callable[[Any], bytes]
+
+
+def _stdlib_backend() -> XmlBackend:
+    return XmlBackend(
+        name="stdlib",
+        fromstring=ET.fromstring,
+        tostring=lambda root: ET.tostring(root, encoding="utf-8", xml_declaration=True),
+    )
+
+
+def _lxml_backend() -> XmlBackend:
+    from lxml import etree
+
+    # DOCX parts are untrusted input: no entity expansion or network access; large
+    # documents need huge_tree to lift libxml2's depth/text-node limits.
+    parser = etree.XMLParser(resolve_entities=False, no_network=True, huge_tree=True)
+
+    def tostring(root: Any) -> bytes:
+        tree = root.getroottree()
+        return etree.tostring(
+            tree,
+            encoding="UTF-8",
+            xml_declaration=True,
+            standalone=tree.docinfo.standalone,
+        )
+
+    return XmlBackend(
+        name="lxml",
+        fromstring=lambda data: etree.fromstring(data, parser),
+        tostring=tostring,
+    )
+
+
+def default_backend_name() -> str:
+    return os.environ.get(BACKEND_ENV, "auto").strip().lower() or "auto"
+
+
+def get_xml_backend(name: str | None = None) -> XmlBackend:
+    choice = (name or default_backend_name()).strip().lower()
+    if choice not in BACKEND_CHOICES:
+        raise ValueError(f"Unsupported XML backend: {choice} (expected one of {', '.join(BACKEND_CHOICES)})")
+    if choice == "stdlib":
+        return _stdlib_backend()
+    try:
+        return _lxml_backend()
+    except ImportError:
+        if choice == "lxml":
+            raise ValueError("XML backend 'lxml' requested but lxml is not installed") from None
+        return _stdlib_backend()
+
+
+def sub_element(parent: Any, tag: str, attrib: Dict[str, str] | None = None) -> Any:
+    """Backend-neutral ET.SubElement: create a child of the same tree type as parent."""
+    child = parent.makeelement(tag, attrib or {})
+    parent.append(child)
+    return child
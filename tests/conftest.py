@@ -0,0 +1,145 @@
+import sys
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import pytest
+
+# The scripts are flat modules that import each other by name.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+
+def make_text_pdf(path: Path, pages: List[str]) -> Path:
+    """Write a minimal PDF with one line of Helvetica text per page."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", b""]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 << /Type /Font /Subtype /Type1 /BaseFont /Helvetica >> >> >> >>"
+            % content_id
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+    return path
+
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def _docx_paragraph(text: str) -> str:
+    if not text:
+        return "<w:p/>"
+    return f'<w:p><w:r><w:t xml:space="preserve">{text}</w:t></w:r></w:p>'
+
+
+def make_docx(path: Path, questions: int = 6) -> Path:
+    """Write a small Q&A DOCX: "Qn." question paragraphs, each followed by an answer and a blank line.
+
+    The document part carries a comment, and both XML parts use the usual w: prefix plus an
+    unused r: declaration, as Word writes them.
+    """
+    paragraphs = []
+    for i in range(1, questions + 1):
+        paragraphs += [f"Q{i}. What is the metric number {i}?", f"The answer for item {i} is {i * 7} units.", ""]
+    body = "".join(_docx_paragraph(text) for text in paragraphs)
+    namespaces = f'xmlns:w="{W_NS}" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f"<w:document {namespaces}><!-- generated --><w:body>{body}<w:sectPr/></w:body></w:document>"
+    )
+    footnotes = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f"<w:footnotes {namespaces}>"
+        '<w:footnote w:type="separator" w:id="-1"><w:p><w:r><w:separator/></w:r></w:p></w:footnote>'
+        '<w:footnote w:type="continuationSeparator" w:id="0"><w:p><w:r><w:continuationSeparator/></w:r></w:p></w:footnote>'
+        '<w:footnote w:id="1"><w:p><w:r><w:t>Existing source one.</w:t></w:r></w:p></w:footnote>'
+        "</w:footnotes>"
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", '<?xml version="1.0"?><Types/>')
+        zf.writestr("word/document.xml", document)
+        zf.writestr("word/footnotes.xml", footnotes)
+    return path
+
+
+PATCH_SPEC = {
+    "footnote_sources": {"src_a": "Source: A notice, verified 2026-01-01."},
+    "patches": [
+        {
+            "label": "Q3",
+            "anchor": "item 3 is",
+            "question_anchor": "metric number 3?",
+            "replacement": "Updated item 3 answer. [[fn:src_a]]",
+            "reason": "New data.",
+        },
+        {
+            "label": "Q5",
+            "anchor": "The answer for item 5 is 35 units.",
+            "anchor_match": "exact",
+            "replacement": "Item 5 now 40 units. [[fnid:1]]",
+            "reason": "Changed.",
+        },
+        {"label": "Q3b", "anchor": "Updated item 3", "replacement": "Second pass. [[fn:src_a]]", "reason": "Chained."},
+    ],
+}
+
+
+class _RouteHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self.server.requests.append((self.path, dict(self.headers)))
+        route = self.server.routes.get(self.path.split("?")[0])
+        if route is None:
+            send_body(self, b"not found", status=404)
+        else:
+            route(self)
+
+
+def send_body(handler: BaseHTTPRequestHandler, body: bytes, status: int = 200, headers: Dict[str, str] | None = None) -> None:
+    handler.send_response(status)
+    for name, value in (headers or {}).items():
+        handler.send_header(name, value)
+    handler.send_header("Content-Length", str(len(body)))
+    handler.end_headers()
+    handler.wfile.write(body)
+
+
+@pytest.fixture
+def http_server(monkeypatch):
+    """A local threaded HTTP server: set server.routes[path] = handler_fn, fetch server.url(path).
+
+    server.requests records (path, headers) for every GET.
+    """
+    for name in ("http_proxy", "https_proxy", "all_proxy", "HTTP_PROXY", "HTTPS_PROXY", "ALL_PROXY"):
+        monkeypatch.delenv(name, raising=False)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RouteHandler)
+    server.daemon_threads = True
+    server.routes: Dict[str, Callable[[BaseHTTPRequestHandler], None]] = {}
+    server.requests = []
+    server.url = lambda path: f"http://127.0.0.1:{server.server_port}{path}"
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
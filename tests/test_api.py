@@ -0,0 +1,29 @@
+from conftest import make_text_pdf
+from openrevise.api import run_gate
+
+
+def _config(pdf, early_exit: bool) -> dict:
+    return {
+        "required_sources": {
+            "loc": {"type": "local_pdf", "path": str(pdf), "must_include": ["dose"], "early_exit": early_exit}
+        },
+        "optional_sources": {},
+    }
+
+
+def test_run_gate_caps_evidence_hits(tmp_path):
+    pdf = make_text_pdf(tmp_path / "src.pdf", ["dose one", "dose two", "dose three"])
+    default = run_gate(_config(pdf, False))["results"][0]["evidence"][0]
+    capped = run_gate(_config(pdf, False), max_evidence_hits=1)["results"][0]["evidence"][0]
+
+    assert default["hit_count"] == capped["hit_count"] == 3
+    assert len(default["hits"]) == 3 and len(capped["hits"]) == 1
+
+
+def test_run_gate_full_traversal_overrides_early_exit(tmp_path):
+    pdf = make_text_pdf(tmp_path / "src.pdf", ["dose one", "dose two", "dose three"])
+    early = run_gate(_config(pdf, True))["results"][0]
+    full = run_gate(_config(pdf, True), full_traversal=True)["results"][0]
+
+    assert early["scan_mode"] == "early_exit" and early["pages_checked"] < 3
+    assert full["scan_mode"] == "full" and full["pages_checked"] == 3
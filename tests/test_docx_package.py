@@ -0,0 +1,101 @@
+import io
+import struct
+import zipfile
+
+import pytest
+
+import docx_package
+from docx_package import DOCUMENT_PART, DocxPackage
+
+# Fields a copied member must keep; compress_size only holds for the raw path (no re-compression).
+_INFO_FIELDS = ("filename", "CRC", "compress_type", "file_size", "date_time", "external_attr")
+
+
+def _docx(path, streamed=False):
+    """Members of every kind the raw copy must handle; streamed=True writes them all with
+    data descriptors (flag bit 3), as a writer on an unseekable stream does."""
+    out = _Unseekable() if streamed else path
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", "<Types/>")
+        zf.writestr(DOCUMENT_PART, '<w:document xmlns:w="urn:w"><w:body/></w:document>')
+        zf.writestr("word/media/image1.bin", bytes(range(256)) * 64)
+        zf.writestr("word/media/stored.bin", bytes(range(256)) * 16, compress_type=zipfile.ZIP_STORED)
+        zf.writestr("word/empty.xml", b"")
+        zf.writestr("customXml/", b"")
+        # A zip64 extra field on a small member, as some writers emit.
+        with zf.open("word/zip64.xml", "w", force_zip64=True) as f:
+            f.write(b"<zip64/>" * 500)
+    if streamed:
+        path.write_bytes(bytes(out.data))
+    return path
+
+
+class _Unseekable(io.RawIOBase):
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, chunk):
+        self.data += chunk
+        return len(chunk)
+
+
+def _local_extra_length(path, info):
+    with open(path, "rb") as f:
+        f.seek(info.header_offset)
+        return struct.unpack("<H", f.read(30)[28:30])[0]
+
+
+def _infos(source):
+    with zipfile.ZipFile(source) as zf:
+        assert zf.testzip() is None
+        return {info.filename: (info, zf.read(info)) for info in zf.infolist()}
+
+
+def _save(src, output, changed=()):
+    with DocxPackage(src) as package:
+        package.save(output, changed)
+    return output
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_raw_copy_keeps_every_member_as_in_the_source(tmp_path, streamed):
+    src = _docx(tmp_path / "in.docx", streamed)
+    source = _infos(src)
+    assert _local_extra_length(src, source["word/zip64.xml"][0]) > 0
+    assert all(bool(info.flag_bits & 0x08) == streamed for info, _ in source.values())
+    copied = _infos(_save(src, tmp_path / "raw.docx"))
+
+    assert list(copied) == list(source)
+    for name, (info, data) in copied.items():
+        src_info, src_data = source[name]
+        assert data == src_data
+        assert [getattr(info, f) for f in _INFO_FIELDS] == [getattr(src_info, f) for f in _INFO_FIELDS]
+        assert info.compress_size == src_info.compress_size
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+@pytest.mark.parametrize("changed", [(), (DOCUMENT_PART,)])
+def test_raw_copy_matches_a_writestr_copy(tmp_path, monkeypatch, changed, streamed):
+    src = _docx(tmp_path / "in.docx", streamed)
+    raw = _infos(_save(src, tmp_path / "raw.docx", changed))
+    monkeypatch.setattr(docx_package, "_RAW_COPY_ATTRS", ("fp", "no_such_attr"))
+    fallback = _infos(_save(src, tmp_path / "fallback.docx", changed))
+
+    assert list(raw) == list(fallback)
+    for name, (info, data) in raw.items():
+        other, other_data = fallback[name]
+        assert data == other_data
+        assert [getattr(info, f) for f in _INFO_FIELDS] == [getattr(other, f) for f in _INFO_FIELDS]
+
+
+def test_unseekable_output_falls_back_to_writestr(tmp_path):
+    src = _docx(tmp_path / "in.docx")
+    out = _Unseekable()
+    _save(src, out)
+    copied = _infos(io.BytesIO(bytes(out.data)))
+    assert {name: data for name, (_, data) in copied.items()} == {
+        name: data for name, (_, data) in _infos(src).items()
+    }
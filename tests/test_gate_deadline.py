@@ -0,0 +1,44 @@
+import time
+
+import check_revise_sources
+from check_revise_sources import CheckOptions, run_check_config
+from conftest import send_body
+from gate_result_store import GateResultStore
+
+
+def _memo_entries(root):
+    return [p for p in root.rglob("*.json") if "verified" not in p.parts]
+
+
+def test_timed_out_check_writes_nothing_after_the_gate_returns(tmp_path, http_server, monkeypatch):
+    read_text_body = check_revise_sources._read_text_body
+
+    def slow_parse(path, scan):
+        if "slow" in path.read_text(encoding="utf-8"):
+            time.sleep(1.0)
+        return read_text_body(path, scan)
+
+    monkeypatch.setattr(check_revise_sources, "_read_text_body", slow_parse)
+    http_server.routes["/slow"] = lambda handler: send_body(handler, b"slow body with token alpha")
+    http_server.routes["/fast"] = lambda handler: send_body(handler, b"fast body with token alpha")
+    config = {
+        "required_sources": {
+            "fast": {"type": "url_text", "url": http_server.url("/fast"), "must_include": ["alpha"]},
+            "slow": {"type": "url_text", "url": http_server.url("/slow"), "must_include": ["alpha"]},
+        },
+        "optional_sources": {},
+    }
+    options = CheckOptions(
+        max_workers=2,
+        parsed_dir=tmp_path / "parsed",
+        memo=GateResultStore(tmp_path / "gate"),
+        time_limit=0.5,
+    )
+
+    fast, slow = run_check_config(config, options)["results"]
+    assert fast["ok"] and not fast["timed_out"]
+    assert slow["timed_out"] and not slow["ok"]
+
+    time.sleep(1.0)  # a check left running would have finished by now
+    assert sorted(p.name for p in (tmp_path / "parsed").iterdir()) == ["fast.txt"]
+    assert len(_memo_entries(tmp_path / "gate")) == 1
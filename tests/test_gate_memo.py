@@ -0,0 +1,72 @@
+from pathlib import Path
+
+from check_revise_sources import CheckOptions, run_check_config
+from conftest import make_text_pdf
+from gate_result_store import GateResultStore
+from pdf_text import PdfTextCache
+from source_snapshot import SnapshotRecorder
+
+
+def _config(pdf: Path) -> dict:
+    return {
+        "required_sources": {
+            "loc": {"type": "local_pdf", "path": str(pdf), "must_include": ["renal dose adjustment"]}
+        },
+        "optional_sources": {},
+    }
+
+
+def _gate(tmp_path: Path, pdf: Path, run_id: str, text_cache: PdfTextCache | None) -> dict:
+    options = CheckOptions(
+        parsed_dir=tmp_path / run_id / "sources_parsed",
+        text_cache=text_cache,
+        memo=GateResultStore(tmp_path / "gate"),
+        run_id=run_id,
+    )
+    return run_check_config(_config(pdf), options)["results"][0]
+
+
+def test_memo_hit_rewrites_parsed_text_from_text_cache(tmp_path):
+    pdf = make_text_pdf(tmp_path / "src.pdf", ["Intro page", "Renal dose adjustment applies"])
+    text_cache = PdfTextCache(tmp_path / "text")
+    first = _gate(tmp_path, pdf, "run1", text_cache)
+    second = _gate(tmp_path, pdf, "run2", text_cache)
+
+    assert first["memo_status"] == "miss" and second["memo_status"] == "hit"
+    assert second["parsed_path"] == str(tmp_path / "run2" / "sources_parsed" / "loc.txt")
+    assert second["parsed_run_id"] == ""
+    assert Path(second["parsed_path"]).read_text(encoding="utf-8") == Path(first["parsed_path"]).read_text(
+        encoding="utf-8"
+    )
+
+
+def test_memo_hit_without_text_points_at_producing_run(tmp_path):
+    pdf = make_text_pdf(tmp_path / "src.pdf", ["Renal dose adjustment applies"])
+    first = _gate(tmp_path, pdf, "run1", None)
+    second = _gate(tmp_path, pdf, "run2", None)
+
+    assert second["ok"] and second["memo_status"] == "hit"
+    assert second["parsed_run_id"] == "run1"
+    assert Path(second["parsed_path"]) == Path(first["parsed_path"]).resolve()
+    assert Path(second["parsed_path"]).exists()
+
+
+def test_max_age_reuse_and_ignored_note(tmp_path):
+    pdf = make_text_pdf(tmp_path / "src.pdf", ["Renal dose adjustment applies"])
+    cfg = _config(pdf)
+    cfg["required_sources"]["loc"]["max_age"] = "1d"
+    memo = GateResultStore(tmp_path / "gate")
+
+    first = run_check_config(cfg, CheckOptions(memo=memo, run_id="run1"))["results"][0]
+    second = run_check_config(cfg, CheckOptions(memo=memo, run_id="run2"))["results"][0]
+    assert first["ok"] and not first["reused"] and first["detail"] == "all tokens matched"
+    assert second["reused"] and second["detail"] == "all tokens matched"
+
+    off = run_check_config(cfg, CheckOptions())["results"][0]
+    assert off["ok"] and not off["reused"]
+    assert off["detail"] == "all tokens matched (max_age ignored: gate result store is off)"
+
+    with SnapshotRecorder(tmp_path / "snap.zip") as recorder:
+        recording = run_check_config(cfg, CheckOptions(memo=memo, run_id="run3", recorder=recorder))["results"][0]
+    assert not recording["reused"]
+    assert recording["detail"].endswith("(max_age ignored: recording a source snapshot)")
@@ -0,0 +1,99 @@
+import re
+
+import pytest
+
+from check_revise_sources import _open_pdf_range
+from conftest import send_body
+from http_client import HttpClient, HttpError, HttpRangeFile
+
+BODY = bytes(range(256)) * 64  # 16 KiB
+RANGE_RE = re.compile(r"bytes=(\d+)-(\d+)")
+
+
+def _range_route(state):
+    """Serves state["body"] with Range support; If-Range with a stale ETag gets the full 200 body."""
+
+    def route(handler):
+        body, etag = state["body"], state["etag"]
+        match = RANGE_RE.fullmatch(handler.headers.get("Range", ""))
+        if_range = handler.headers.get("If-Range")
+        if match is None or not state.get("ranges", True) or (if_range and if_range != etag):
+            send_body(handler, body, headers={"ETag": etag})
+            return
+        first, last = int(match.group(1)), min(int(match.group(2)), len(body) - 1)
+        send_body(
+            handler,
+            body[first : last + 1],
+            status=206,
+            headers={"ETag": etag, "Content-Range": f"bytes {first}-{last}/{len(body)}"},
+        )
+
+    return route
+
+
+@pytest.fixture
+def range_server(http_server):
+    state = {"body": BODY, "etag": '"v1"'}
+    http_server.routes["/doc.pdf"] = _range_route(state)
+    http_server.state = state
+    return http_server
+
+
+def _range_file(server, client, **kwargs):
+    return HttpRangeFile(client, server.url("/doc.pdf"), len(BODY), validator='"v1"', block_size=1024, **kwargs)
+
+
+def test_reads_match_the_body_and_blocks_are_cached(range_server):
+    with HttpClient() as client:
+        f = _range_file(range_server, client, max_blocks=8)
+        f.seek(1000)
+        assert f.read(3000) == BODY[1000:4000]
+        assert f.requests == 1  # blocks 0-3 in one request
+        f.seek(1500)
+        assert f.read(100) == BODY[1500:1600]
+        assert f.requests == 1  # served from the block cache
+        f.seek(-10, 2)
+        assert f.read() == BODY[-10:]
+        assert f.requests == 2
+        assert f.read() == b""
+
+
+def test_block_cache_is_bounded_lru(range_server):
+    with HttpClient() as client:
+        f = _range_file(range_server, client, max_blocks=2)
+        for start in (0, 1024, 2048):
+            f.seek(start)
+            f.read(1)
+        assert f.requests == 3
+        f.seek(0)
+        f.read(1)  # block 0 was evicted
+        assert f.requests == 4
+        f.seek(2048)
+        f.read(1)  # block 2 is still cached
+        assert f.requests == 4
+
+
+def test_changed_validator_fails_instead_of_mixing_versions(range_server):
+    with HttpClient() as client:
+        f = _range_file(range_server, client)
+        assert f.read(10) == BODY[:10]
+        range_server.state.update(body=BODY[::-1], etag='"v2"')
+        f.seek(4096)
+        with pytest.raises(HttpError):
+            f.read(10)
+        # The full 200 body is refused on its declared size, not read.
+        assert f.transferred == 1024
+
+
+def test_open_pdf_range_uses_ranges_or_falls_back_to_a_download(range_server):
+    url = range_server.url("/doc.pdf")
+    with HttpClient() as client:
+        range_file, fetched = _open_pdf_range(client, url)
+        assert fetched is None and range_file.size == len(BODY) and range_file.validator == '"v1"'
+        range_file.close()
+
+        range_server.state["ranges"] = False
+        range_file, fetched = _open_pdf_range(client, url)
+    assert range_file is None
+    assert fetched.path.read_bytes() == BODY
+    fetched.path.unlink()
@@ -0,0 +1,18 @@
+import check_revise_sources
+from check_revise_sources import match_tokens, normalize_body
+
+
+def test_per_token_and_automaton_paths_agree(monkeypatch):
+    body = normalize_body("Dose adjust-\nment for renal  impairment; aaaa dose ADJUSTMENT.").text
+    tokens = ["dose adjustment", "aa", "RENAL impairment", "absent", "  "]
+
+    monkeypatch.setattr(check_revise_sources, "MATCH_AUTOMATON_MIN_TOKENS", 10**6)
+    per_token = match_tokens(body, tokens)
+    monkeypatch.setattr(check_revise_sources, "MATCH_AUTOMATON_MIN_TOKENS", 1)
+    automaton = match_tokens(body, tokens)
+
+    assert per_token == automaton
+    assert len(per_token[0]) == 2
+    assert len(per_token[1]) == 3  # overlapping hits in "aaaa"
+    assert per_token[3] == []
+    assert per_token[4] is None
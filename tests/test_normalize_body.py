@@ -0,0 +1,26 @@
+import random
+
+from check_revise_sources import _collapse_for_match, normalize_body
+
+
+def _raw_offsets(text: str) -> None:
+    body = normalize_body(text)
+    assert body.text == _collapse_for_match(text).lower()
+    collapsed = _collapse_for_match(text)
+    # Every kept character maps back to the same character in the raw text.
+    for i, ch in enumerate(body.text):
+        if ch != " " and len(collapsed) == len(body.text):
+            assert text[body.raw_offset(i)].lower() == ch
+
+
+def test_matches_collapse_for_match_on_random_text():
+    rng = random.Random(5)
+    alphabet = ["a", "B", "-", " ", "  ", "\n", "\t", "　", "\xa0", "x-\n y", "İ", "é"]
+    for _ in range(2000):
+        _raw_offsets("".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30))))
+
+
+def test_hyphen_join_and_whitespace_runs():
+    body = normalize_body("  Inde-\n  pendent\t\treview ")
+    assert body.text == "independent review"
+    assert body.raw_offset(body.text.index("review")) == "  Inde-\n  pendent\t\treview ".index("review")
@@ -0,0 +1,124 @@
+import random
+import xml.etree.ElementTree as ET
+
+from revise_docx import (
+    ParagraphIndex,
+    ParagraphPatch,
+    _find_patch_target,
+    _matches,
+    apply_tracked_replacement,
+    paragraph_text,
+    qn,
+    tokenize_replacement,
+)
+
+TEXTS = [
+    "Q1. Is renal dosing covered?",
+    "Dose adjustment for renal impairment is required.",
+    "",
+    "Q2. Hepatic impairment?",
+    "   ",
+    "No dose adjustment for hepatic impairment.",
+    "Q1. Is renal dosing covered?",
+    "Dose adjustment applies.",
+]
+
+PATCHES = [
+    ParagraphPatch(anchor="dose adjustment", replacement="", label="a", reason=""),
+    ParagraphPatch(anchor="Dose adjustment", replacement="", label="b", reason="", question_anchor="renal"),
+    ParagraphPatch(anchor="impairment", replacement="", label="c", reason="", question_anchor="Q2. Hepatic impairment?", question_match="exact"),
+    ParagraphPatch(anchor="Dose adjustment applies.", replacement="", label="d", reason="", anchor_match="exact"),
+    ParagraphPatch(anchor="Q", replacement="", label="e", reason="", question_anchor="covered", question_match="contains"),
+]
+
+EDITS = [
+    "",
+    "Q2. Hepatic impairment?",
+    "Dose adjustment applies.",
+    "  renal  ",
+    "Dose adjustment for renal impairment is required.",
+    "covered",
+    "Q",
+]
+
+
+def _paragraph(text):
+    para = ET.Element(qn("p"))
+    if text:
+        ET.SubElement(ET.SubElement(para, qn("r")), qn("t")).text = text
+    return para
+
+
+def _naive_question(paragraphs, pos):
+    for prev in range(pos - 1, -1, -1):
+        text = paragraph_text(paragraphs[prev]).strip()
+        if text:
+            return text
+    return ""
+
+
+def _naive_targets(paragraphs, patch):
+    out = []
+    for pos, para in enumerate(paragraphs):
+        if not _matches(paragraph_text(para), patch.anchor, patch.anchor_match):
+            continue
+        if patch.question_anchor and not _matches(_naive_question(paragraphs, pos), patch.question_anchor, patch.question_match):
+            continue
+        out.append(pos)
+    return out
+
+
+def _index_targets(index, patch):
+    try:
+        return [_find_patch_target(index, patch)[1]]
+    except ValueError as exc:
+        return "none" if "did not match" in str(exc) else "many"
+
+
+def _assert_index_matches_rebuild(index, paragraphs):
+    fresh = ParagraphIndex(paragraphs, PATCHES)
+    for pos, (got, want) in enumerate(zip(index.entries, fresh.entries)):
+        assert (got.text, got.prev, got.hits, got.stripped_hits) == (want.text, want.prev, want.hits, want.stripped_hits), pos
+        assert index.question_text(pos) == _naive_question(paragraphs, pos)
+    for patch in PATCHES:
+        for needle, mode in ((patch.anchor, patch.anchor_match), (patch.question_anchor, patch.question_match)):
+            if needle:
+                assert index.anchor_positions(needle, mode) == fresh.anchor_positions(needle, mode)
+        if patch.question_anchor and patch.question_match == "exact":
+            assert index.exact_question_positions(patch.question_anchor) == fresh.exact_question_positions(patch.question_anchor)
+        naive = _naive_targets(paragraphs, patch)
+        assert _index_targets(index, patch) == (naive if len(naive) == 1 else "none" if not naive else "many"), patch.label
+
+
+def test_refresh_after_tracked_edits_matches_a_rebuilt_index():
+    rng = random.Random(3)
+    paragraphs = [_paragraph(text) for text in TEXTS]
+    index = ParagraphIndex(paragraphs, PATCHES)
+    _assert_index_matches_rebuild(index, paragraphs)
+
+    change_id = 1
+    for _ in range(40):
+        pos = rng.randrange(len(paragraphs))
+        change_id = apply_tracked_replacement(
+            paragraph=paragraphs[pos],
+            new_tokens=tokenize_replacement(rng.choice(EDITS)),
+            new_footnote_id_map={},
+            change_id_start=change_id,
+            author="test",
+            date_iso="2026-01-01T00:00:00Z",
+        )
+        index.refresh(pos)
+        _assert_index_matches_rebuild(index, paragraphs)
+
+
+def test_index_without_contains_needles_still_refreshes():
+    patches = [ParagraphPatch(anchor="B", replacement="", label="x", reason="", anchor_match="exact")]
+    paragraphs = [_paragraph(text) for text in ("A", "B", "C")]
+    index = ParagraphIndex(paragraphs, patches)
+    assert index.anchor_positions("B", "exact") == [1]
+    assert index.anchor_positions("C", "contains") == [2]  # falls back to a scan
+
+    apply_tracked_replacement(paragraphs[1], tokenize_replacement(""), {}, 1, "test", "2026-01-01T00:00:00Z")
+    index.refresh(1)
+    assert index.anchor_positions("B", "exact") == []
+    assert index.entries[2].prev == 0 and index.question_text(2) == "A"
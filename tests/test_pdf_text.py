@@ -0,0 +1,48 @@
+import time
+from concurrent.futures import Executor, Future
+from pathlib import Path
+
+import pytest
+from pypdf import PdfWriter
+
+from pdf_text import _extract_pages, extract_pdf_text
+
+
+def _blank_pdf(path: Path, pages: int) -> Path:
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=200, height=200)
+    with path.open("wb") as f:
+        writer.write(f)
+    return path
+
+
+class _StalledPool(Executor):
+    """Accepts shards but never runs them, so every future.result() times out."""
+
+    def __init__(self) -> None:
+        self.futures = []
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        self.futures.append(future)
+        return future
+
+
+def test_shard_timeout_raises_builtin_timeout_error(tmp_path):
+    pdf = _blank_pdf(tmp_path / "doc.pdf", 32)
+    pool = _StalledPool()
+
+    with pytest.raises(TimeoutError, match="Deadline exceeded"):
+        extract_pdf_text(pdf, pool=pool, shards=2, deadline=time.monotonic() + 0.05)
+
+    assert len(pool.futures) == 2
+    assert all(future.cancelled() for future in pool.futures)
+
+
+def test_shard_worker_stops_at_deadline(tmp_path):
+    pdf = _blank_pdf(tmp_path / "doc.pdf", 4)
+
+    with pytest.raises(TimeoutError):
+        _extract_pages(pdf, [0, 1, 2, 3], deadline=time.monotonic() - 1)
+    assert _extract_pages(pdf, [0, 1], deadline=time.monotonic() + 60) == ["", ""]
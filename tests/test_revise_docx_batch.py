@@ -0,0 +1,79 @@
+import csv
+import json
+import sys
+
+import pytest
+
+import revise_docx_batch
+from conftest import PATCH_SPEC, make_docx
+from revise_docx import revise_docx_file
+
+
+def _run(monkeypatch, *argv):
+    monkeypatch.setattr(sys, "argv", ["revise_docx_batch.py", *argv])
+    return revise_docx_batch.main()
+
+
+def _summary(path):
+    with path.open(newline="", encoding="utf-8-sig") as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_batch_summary_records_every_outcome(tmp_path, monkeypatch, capsys, fmt, workers):
+    make_docx(tmp_path / "clean.docx")
+    (tmp_path / "spec.json").write_text(json.dumps(PATCH_SPEC), encoding="utf-8")
+    revise_docx_file(
+        input_docx=tmp_path / "clean.docx",
+        output_docx=tmp_path / "revised.docx",
+        patch_spec=tmp_path / "spec.json",
+        audit_csv=tmp_path / "revised_audit.csv",
+        author="test",
+        date_iso="2026-01-01T00:00:00Z",
+    )
+    jobs = [
+        {"input_docx": "clean.docx", "patch_spec": "spec.json", "output_docx": "out/ok.docx"},
+        {"input_docx": "revised.docx", "patch_spec": "spec.json", "output_docx": "out/refused.docx"},
+        {"input_docx": "missing.docx", "patch_spec": "spec.json", "output_docx": "out/missing.docx"},
+    ]
+    manifest = tmp_path / f"jobs.{fmt}"
+    if fmt == "csv":
+        with manifest.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=revise_docx_batch.MANIFEST_FIELDS)
+            writer.writeheader()
+            writer.writerows(jobs)
+    else:
+        manifest.write_text("".join(json.dumps(job) + "\n" for job in jobs), encoding="utf-8")
+
+    assert _run(monkeypatch, "--manifest", str(manifest), "--workers", workers, "--date", "2026-01-01T00:00:00Z") == 1
+
+    rows = _summary(tmp_path / "jobs_summary.csv")
+    assert [(r["job"], r["status"], r["exit_code"]) for r in rows] == [
+        ("1", "SUCCEEDED", "0"),
+        ("2", "REFUSED", "3"),
+        ("3", "FAILED", "1"),
+    ]
+    assert rows[0]["applied_patches"] == ",".join(p["label"] for p in PATCH_SPEC["patches"])
+    assert (tmp_path / "out" / "ok.docx").exists() and (tmp_path / "out" / "ok_change_audit.csv").exists()
+    assert "tracked revisions" in rows[1]["detail"]
+    assert not (tmp_path / "out" / "refused.docx").exists()
+    assert rows[2]["detail"].startswith("Input docx not found")
+    assert "Jobs: 3 succeeded: 1 failed: 2" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    "name, content",
+    [
+        ("bad.jsonl", '{"input_docx": "a.docx", "patch_spec": "s.json", "output_docx": "b.docx"}\n{not json\n'),
+        ("bad.csv", "input_docx,patch_spec,output_docx\na.docx,,b.docx\n"),
+    ],
+)
+def test_invalid_manifest_exits_1_without_traceback(tmp_path, monkeypatch, capsys, name, content):
+    manifest = tmp_path / name
+    manifest.write_text(content, encoding="utf-8")
+    assert _run(monkeypatch, "--manifest", str(manifest), "--workers", "1") == 1
+    err = capsys.readouterr().err
+    assert err.startswith(f"Invalid manifest {manifest}: Manifest ")
+    assert "line 2" in err or "job 1" in err
+    assert not (tmp_path / f"{manifest.stem}_summary.csv").exists()
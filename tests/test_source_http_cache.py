@@ -0,0 +1,80 @@
+import os
+import stat
+
+import pytest
+
+import source_http_cache
+from check_revise_sources import _fetch_url_to_file
+from conftest import send_body
+from http_client import HttpClient
+from source_http_cache import HttpCache
+
+
+@pytest.fixture
+def versioned(http_server):
+    """/doc serves state["body"]; a matching If-None-Match gets 304."""
+    state = {"body": b"first version", "etag": '"v1"'}
+
+    def route(handler):
+        if handler.headers.get("If-None-Match") == state["etag"]:
+            handler.send_response(304)
+            handler.send_header("ETag", state["etag"])
+            handler.send_header("Content-Length", "0")
+            handler.end_headers()
+            return
+        send_body(handler, state["body"], headers={"ETag": state["etag"], "Last-Modified": "Mon, 01 Jun 2026 00:00:00 GMT"})
+
+    http_server.routes["/doc"] = route
+    http_server.state = state
+    return http_server
+
+
+def test_revalidation_reuses_the_stored_body(tmp_path, versioned):
+    cache = HttpCache(tmp_path / "cache")
+    url = versioned.url("/doc")
+    with HttpClient() as client:
+        first = _fetch_url_to_file(client, url, cache=cache)
+        second = _fetch_url_to_file(client, url, cache=cache)
+        versioned.state.update(body=b"second version", etag='"v2"')
+        third = _fetch_url_to_file(client, url, cache=cache)
+
+    assert (first.cache_status, second.cache_status, third.cache_status) == ("miss", "hit", "miss")
+    assert second.path == first.path == cache.object_path(first.sha256)
+    assert second.path.read_bytes() == b"first version" and second.transferred == 0
+    assert third.path.read_bytes() == b"second version"
+    headers = [h for _, h in versioned.requests]
+    assert "If-None-Match" not in headers[0]
+    assert headers[1]["If-None-Match"] == '"v1"'
+    assert headers[1]["If-Modified-Since"] == "Mon, 01 Jun 2026 00:00:00 GMT"
+    assert cache.lookup(url).sha256 == third.sha256
+    # Stored objects are immutable, and nothing is left in the spool directory.
+    assert not os.stat(first.path).st_mode & stat.S_IWUSR
+    assert list(cache.spool_dir.iterdir()) == []
+
+
+def test_lookup_ignores_an_entry_whose_object_is_gone(tmp_path, versioned):
+    cache = HttpCache(tmp_path / "cache")
+    with HttpClient() as client:
+        fetched = _fetch_url_to_file(client, versioned.url("/doc"), cache=cache)
+    os.chmod(fetched.path, 0o644)
+    fetched.path.unlink()
+    assert cache.lookup(versioned.url("/doc")) is None
+
+
+def test_materialize_hardlinks_or_copies(tmp_path, versioned, monkeypatch):
+    cache = HttpCache(tmp_path / "cache")
+    with HttpClient() as client:
+        fetched = _fetch_url_to_file(client, versioned.url("/doc"), cache=cache)
+
+    linked = tmp_path / "run" / "linked.bin"
+    cache.materialize(fetched.sha256, linked)
+    assert os.stat(linked).st_ino == os.stat(fetched.path).st_ino
+
+    def no_link(src, dst):
+        raise OSError("cross-device link")
+
+    monkeypatch.setattr(source_http_cache.os, "link", no_link)
+    copied = tmp_path / "run" / "copied.bin"
+    cache.materialize(fetched.sha256, copied)
+    assert copied.read_bytes() == b"first version"
+    assert os.stat(copied).st_ino != os.stat(fetched.path).st_ino
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from text_match_utils import AhoCorasick
+
+PATTERNS = ["a", "aa", "aba", "ba", "bab", "abab", "aba", "c"]  # overlapping, nested, one duplicate
+
+
+def _naive(text, patterns):
+    return sorted(
+        (start, pattern_id)
+        for pattern_id, pattern in enumerate(patterns)
+        for start in range(len(text) - len(pattern) + 1)
+        if text.startswith(pattern, start)
+    )
+
+
+def _texts():
+    rng = random.Random(7)
+    yield ""
+    yield "ababababa"
+    yield "aaaa"
+    for _ in range(200):
+        yield "".join(rng.choice("abc") for _ in range(rng.randint(1, 40)))
+
+
+def test_iter_matches_agrees_with_naive_scan():
+    automaton = AhoCorasick(PATTERNS)
+    for text in _texts():
+        matches = list(automaton.iter_matches(text))
+        assert sorted(matches) == _naive(text, PATTERNS), text
+        ends = [start + len(PATTERNS[pattern_id]) for start, pattern_id in matches]
+        assert ends == sorted(ends)
+
+
+def test_scanner_finds_matches_spanning_feed_boundaries():
+    automaton = AhoCorasick(PATTERNS)
+    rng = random.Random(11)
+    for text in _texts():
+        cuts = sorted(rng.randint(0, len(text)) for _ in range(rng.randint(0, 6)))
+        pieces = [text[i:j] for i, j in zip([0] + cuts, cuts + [len(text)])]  # may include empty pieces
+        scanner = automaton.scanner()
+        fed = [match for piece in pieces for match in scanner.feed(piece)]
+        assert fed == list(automaton.iter_matches(text)), (text, pieces)
+        assert scanner.offset == len(text)
+
+
+def test_single_character_feeds():
+    automaton = AhoCorasick(["needle", "needles", "dle"])
+    text = "a needle, two needles"
+    scanner = automaton.scanner()
+    fed = [match for ch in text for match in scanner.feed(ch)]
+    assert fed == list(automaton.iter_matches(text))
+    assert sorted(fed) == _naive(text, automaton.patterns)
+
+
+def test_empty_pattern_is_rejected():
+    with pytest.raises(ValueError):
+        AhoCorasick(["ok", ""])
@@ -0,0 +1,40 @@
+import io
+import zipfile
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from build_q_source_map import build_q_map_rows
+from conftest import PATCH_SPEC, make_docx
+from docx_package import DOCUMENT_PART, FOOTNOTES_PART, DocxPackage
+from revise_docx import parse_patch_spec, revise_package
+from xml_backend import get_xml_backend
+
+pytest.importorskip("lxml")
+
+
+def _revise(docx, backend):
+    patches, source_texts = parse_patch_spec(PATCH_SPEC)
+    out = io.BytesIO()
+    with DocxPackage(docx, backend=get_xml_backend(backend)) as package:
+        result = revise_package(package, patches, source_texts, author="T", date_iso="2026-01-01T00:00:00Z")
+        package.save(out, [DOCUMENT_PART, FOOTNOTES_PART])
+        rows = build_q_map_rows(package.part(DOCUMENT_PART), package.part(FOOTNOTES_PART))
+    with zipfile.ZipFile(out) as zf:
+        # C14N drops comments and normalizes prefixes: the byte-level differences the backends may have.
+        parts = {
+            name: ET.canonicalize(zf.read(name).decode("utf-8"), rewrite_prefixes=True)
+            for name in (DOCUMENT_PART, FOOTNOTES_PART)
+        }
+    return result, parts, rows
+
+
+def test_stdlib_and_lxml_write_the_same_trees_and_q_map(tmp_path):
+    docx = make_docx(tmp_path / "in.docx")
+    std_result, std_parts, std_rows = _revise(docx, "stdlib")
+    lxml_result, lxml_parts, lxml_rows = _revise(docx, "lxml")
+
+    assert std_result.applied_labels == lxml_result.applied_labels == ["Q3", "Q5", "Q3b"]
+    assert std_result.audit_rows == lxml_result.audit_rows
+    assert std_parts == lxml_parts
+    assert std_rows == lxml_rows and len(std_rows) == 6